@@ -1,25 +1,50 @@
 import yaml
 import asyncio
+import argparse
 import pandas as pd
 from pathlib import Path
+from loguru import logger
 
 from src.models.config import Config
 from src.bots.trading_bot import TradingBot
+from src.backtesting.cache import BacktestCache, code_digest
+from src.backtesting.robustness import simulate, trade_returns
 from src.strategies.momentum_strategies import (
     EMATrendStrategy,
     SavgolTrendStrategy,
     KalmanTrendStrategy,
 )
-from tests.mock_exchange import MockExchange
+from tests.mock_exchange import MockExchange, TestPosition
 from tests.test_executor import TestExecutor
 
 PROJECT_DIR = Path.cwd()
 TEST_DIR = PROJECT_DIR / "tests"
 CONFIGS_DIR = TEST_DIR / "configs"
 DATA_DIR = TEST_DIR / "data"
+CACHE_DIR = PROJECT_DIR / ".cache" / "backtests"
+
+
+def backtest(config: Config, ohlcv: pd.DataFrame) -> list[TestPosition]:
+    exchange = MockExchange()
+    strategy = KalmanTrendStrategy(config)
+    trading_bot = TradingBot(exchange, strategy)
+
+    asyncio.run(TestExecutor(trading_bot, ohlcv).run())
+    return exchange.trade_history
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Backtest the bundled OHLCV data")
+    parser.add_argument("--no-cache", action="store_true", help="always recompute")
+    parser.add_argument("--clear-cache", action="store_true")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR)
+    parser.add_argument("--cache-max-mb", type=int, default=1024)
+    parser.add_argument(
+        "--simulations", type=int, default=0, help="run a robustness analysis"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
     with (CONFIGS_DIR / "test_config.yaml").open() as f:
         cfg = yaml.safe_load(f)
 
@@ -28,11 +53,32 @@ def main():
     # filename = ""
     ohlcv = pd.read_csv(DATA_DIR / "ohlcv-1h-sol-usdc-usdc.csv")
 
-    exchange = MockExchange()
-    strategy = KalmanTrendStrategy(config)
-    trading_bot = TradingBot(exchange, strategy)
+    cache = BacktestCache(args.cache_dir, args.cache_max_mb * 1024 * 1024)
+    if args.clear_cache:
+        logger.info(f"Removed {cache.invalidate()} cached backtest(s)")
 
-    asyncio.run(TestExecutor(trading_bot, ohlcv).run())
+    if args.no_cache:
+        trades = backtest(config, ohlcv)
+    else:
+        key = cache.key(
+            ohlcv,
+            KalmanTrendStrategy,
+            config,
+            bot=code_digest(TradingBot),
+            executor=code_digest(TestExecutor),
+            exchange=code_digest(MockExchange),
+        )
+        trades = cache.cached(key, lambda: backtest(config, ohlcv))
+
+    pnl = sum(
+        (t.exit_price - t.entry_price) * t.size * (1 if t.side == "long" else -1)
+        for t in trades
+    )
+    logger.info(f"Backtest finished: {len(trades)} trades, PnL {pnl:.2f}")
+
+    if args.simulations and trades:
+        report = simulate(trade_returns(trades), args.simulations, seed=args.seed)
+        print(report.summary().round(4).to_string())
 
 
 if __name__ == "__main__":
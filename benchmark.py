@@ -0,0 +1,50 @@
+import sys
+import argparse
+from loguru import logger
+
+from tests.benchmarks.suite import (
+    BAR_COUNTS,
+    SYMBOL_COUNTS,
+    all_cases,
+    run,
+    compare,
+    load_baselines,
+    save_baselines,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument("--bars", type=int, nargs="+", default=BAR_COUNTS)
+    parser.add_argument("--symbols", type=int, nargs="+", default=SYMBOL_COUNTS)
+    parser.add_argument("--filter", default="", help="only run cases containing this")
+    parser.add_argument("--slow", action="store_true", help="include slow cases")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=5.0)
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument(
+        "--noise-floor", type=float, default=1.0, help="ignored slowdown in ms"
+    )
+    parser.add_argument("--update", action="store_true", help="store new baselines")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    cases = [
+        case
+        for case in all_cases(args.bars, args.symbols)
+        if args.filter in case.name and (args.slow or not case.slow)
+    ]
+    results = run(cases, args.repeat, args.budget)
+
+    if args.update:
+        save_baselines(results)
+
+    report = compare(results, load_baselines(), args.tolerance, args.noise_floor / 1000)
+    print(report.format())
+    return 1 if report.regressions and not args.update else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import sys
+import time
+import asyncio
+import argparse
+import numpy as np
+from loguru import logger
+
+from src.bots.trading_bot import TradingBot
+from src.strategies.momentum_strategies import EMATrendStrategy
+from tests.helpers import config, synthetic_ohlcv
+from tests.http_exchange import BinanceStandIn
+from tests.mock_exchange import MockExchange
+
+
+async def run(args) -> None:
+    symbols = [f"SYM{i}/USDC:USDC" for i in range(args.symbols)]
+    histories = {
+        symbol: synthetic_ohlcv(args.bars + args.cycles, seed=i)
+        for i, symbol in enumerate(symbols)
+    }
+
+    def advance(cycle: int) -> None:
+        for symbol, ohlcv in histories.items():
+            mock.set_ohlcv(symbol, ohlcv.iloc[cycle : cycle + args.bars])
+
+    mock = MockExchange()
+    advance(0)
+    stand_in = BinanceStandIn(mock, latency=args.latency, jitter=args.jitter, seed=0)
+    await stand_in.start()
+    exchange = stand_in.client({"enableRateLimit": not args.no_rate_limit})
+    bot = TradingBot(exchange, EMATrendStrategy(config(symbols)))
+
+    timings, failures = [], 0
+    try:
+        await bot.on_start()
+        stand_in.requests.clear()
+        stand_in.error_rate = args.error_rate
+        start = time.perf_counter()
+        for cycle in range(1, args.cycles + 1):
+            advance(cycle)
+            cycle_start = time.perf_counter()
+            try:
+                await bot.trade()
+            except Exception as e:
+                failures += 1
+                logger.warning(f"Cycle {cycle} failed: {e}")
+            timings.append(time.perf_counter() - cycle_start)
+        elapsed = time.perf_counter() - start
+    finally:
+        await exchange.close()
+        await stand_in.stop()
+
+    requests = sum(stand_in.requests.values())
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99]) * 1000
+    print(f"symbols={args.symbols} cycles={args.cycles} failed={failures}")
+    print(f"throughput: {args.cycles / elapsed:.2f} cycles/s, ", end="")
+    print(
+        f"{requests / elapsed:.1f} requests/s, {requests / args.cycles:.1f} per cycle"
+    )
+    print(f"cycle latency: p50={p50:.1f}ms p95={p95:.1f}ms p99={p99:.1f}ms")
+    print(f"injected errors: {stand_in.errors}")
+    for route, count in sorted(stand_in.requests.items()):
+        print(f"  {route}: {count}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Load-test TradingBot.trade through ccxt against a local stand-in"
+    )
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--bars", type=int, default=1500)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--no-rate-limit", action="store_true", help="disable the ccxt throttler"
+    )
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
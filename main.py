@@ -12,6 +12,8 @@ from src.strategies.momentum_strategies import (
     KalmanTrendStrategy,
 )
 from src.executions.execution import BotExecutor
+from src.exchanges.recording import RecordingExchange
+from src.monitoring.journal import TradeJournal
 
 
 PROJECT_DIR = Path.cwd()
@@ -20,6 +22,8 @@ CONFIGS_DIR = SRC_DIR / "configs"
 
 API_KEY = os.getenv("API_KEY")
 API_SECRET = os.getenv("API_SECRET")
+EXCHANGE_RECORDING = os.getenv("EXCHANGE_RECORDING")
+TRADE_JOURNAL = os.getenv("TRADE_JOURNAL")
 
 
 def main() -> None:
@@ -30,8 +34,11 @@ def main() -> None:
 
     config = Config(**cfg)
     exchange = ccxt.binance({"apiKey": API_KEY, "secret": API_SECRET})
+    if EXCHANGE_RECORDING:
+        exchange = RecordingExchange(exchange, EXCHANGE_RECORDING)
     strategy = KalmanTrendStrategy(config)
-    trading_bot = TradingBot(exchange, strategy)
+    journal = TradeJournal(TRADE_JOURNAL) if TRADE_JOURNAL else None
+    trading_bot = TradingBot(exchange, strategy, journal=journal)
 
     BotExecutor(trading_bot).run()
 
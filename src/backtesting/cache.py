@@ -0,0 +1,184 @@
+import sys
+import json
+import time
+import pickle
+import hashlib
+import inspect
+import pandas as pd
+from collections.abc import Callable
+from dataclasses import asdict
+from pathlib import Path
+from loguru import logger
+
+from src.models.config import Config
+from src.strategies.strategy import Strategy
+
+DEFAULT_MAX_BYTES = 1 << 30
+
+
+def data_digest(ohlcv: pd.DataFrame | pd.Series) -> str:
+    """Digest of the values and index of an OHLCV slice"""
+    hashes = pd.util.hash_pandas_object(ohlcv, index=True).to_numpy()
+    digest = hashlib.sha256(hashes.tobytes())
+    digest.update(json.dumps(list(map(str, getattr(ohlcv, "columns", [])))).encode())
+    return digest.hexdigest()
+
+
+def source_modules(cls: type) -> list[str]:
+    """The module of a class and every project module it imports, transitively
+
+    Project modules are those in `src` and in the top-level package of the
+    class itself, third-party code is left out.
+    """
+    packages = {"src", cls.__module__.split(".")[0]}
+    seen: set[str] = set()
+    stack = [cls.__module__]
+    while stack:
+        name = stack.pop()
+        if name in seen or (module := sys.modules.get(name)) is None:
+            continue
+
+        seen.add(name)
+        for value in vars(module).values():
+            dependency = (
+                value.__name__
+                if inspect.ismodule(value)
+                else getattr(value, "__module__", None)
+            )
+            if isinstance(dependency, str) and dependency.split(".")[0] in packages:
+                stack.append(dependency)
+
+    return sorted(seen)
+
+
+def code_digest(cls: type) -> str:
+    """Digest of a class, its `version` and the source of all modules it uses"""
+    version = getattr(cls, "version", 0)
+    digest = hashlib.sha256(f"{cls.__module__}.{cls.__qualname__}:{version}".encode())
+    for name in source_modules(cls):
+        try:
+            source = inspect.getsource(sys.modules[name])
+        except (OSError, TypeError):
+            source = ""
+        digest.update(f"{name}\n{source}".encode())
+
+    return digest.hexdigest()
+
+
+class BacktestCache:
+    """Content-addressed on-disk cache for backtest results
+
+    Entries are keyed by a hash of the OHLCV data, the strategy class with its
+    version and the source of every project module it uses, the config and
+    any extra parts such as the kind of result. They are stored as pickles in
+    one directory per strategy, so a strategy can be invalidated as a whole.
+    Reads refresh the modification time, which drives LRU eviction once the
+    cache exceeds `max_bytes`.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def key(
+        self,
+        ohlcv: pd.DataFrame | pd.Series,
+        strategy: type[Strategy],
+        config: Config,
+        **parts,
+    ) -> str:
+        digest = hashlib.sha256()
+        digest.update(data_digest(ohlcv).encode())
+        digest.update(code_digest(strategy).encode())
+        digest.update(json.dumps(asdict(config), sort_keys=True, default=str).encode())
+        digest.update(json.dumps(parts, sort_keys=True, default=str).encode())
+        return f"{strategy.__name__}/{digest.hexdigest()}"
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.pkl"
+
+    def get(self, key: str, default=None):
+        path = self.path(key)
+        try:
+            with path.open("rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return default
+        except (pickle.UnpicklingError, EOFError) as e:
+            logger.warning(f"Dropping corrupt cache entry {key}: {str(e)}")
+            path.unlink(missing_ok=True)
+            return default
+
+        path.touch(exist_ok=True)
+        return value
+
+    def put(self, key: str, value) -> None:
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first, readers never see partial entries
+        tmp = path.with_suffix(f".{time.monotonic_ns()}.tmp")
+        with tmp.open("wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+
+        self.evict()
+
+    def cached(self, key: str, compute: Callable):
+        """Return the cached value of a key, computing and storing it on a miss"""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+
+        return value
+
+    def invalidate(
+        self, key: str | None = None, strategy: type[Strategy] | None = None
+    ) -> int:
+        """Remove one entry, all entries of a strategy or, without arguments, all"""
+        if key is not None:
+            paths = [self.path(key)]
+        elif strategy is not None:
+            paths = list((self.directory / strategy.__name__).glob("*.pkl"))
+        else:
+            paths = list(self.directory.glob("*/*.pkl"))
+
+        removed = 0
+        for path in paths:
+            if path.exists():
+                path.unlink(missing_ok=True)
+                removed += 1
+
+        return removed
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.directory.glob("*/*.pkl"):
+            # Entries may be removed concurrently by other processes
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        return entries
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits `max_bytes`"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        return removed
@@ -0,0 +1,203 @@
+import os
+import numpy as np
+import pandas as pd
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from src.market_data.shared import CandleRegistry, SharedCandles
+
+METHODS = ("bootstrap", "shuffle", "slippage")
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+# Upper bound of simulated values held in memory per chunk
+CHUNK_ELEMENTS = 4_000_000
+
+
+def trade_returns(trades: Iterable) -> np.ndarray:
+    """Returns per trade relative to its notional, from closed positions"""
+    return np.array(
+        [
+            (t.exit_price / t.entry_price - 1) * (1 if t.side == "long" else -1)
+            for t in trades
+        ]
+    )
+
+
+def block_bootstrap(
+    returns: np.ndarray, n: int, block_size: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Resample paths of circular blocks, which keeps short-range dependence"""
+    length = len(returns)
+    n_blocks = -(-length // block_size)
+    starts = rng.integers(0, length, size=(n, n_blocks, 1))
+    index = (starts + np.arange(block_size)).reshape(n, -1)[:, :length] % length
+    return returns[index]
+
+
+def _block_stats(returns: np.ndarray, length: int) -> tuple[np.ndarray, ...]:
+    """Sum, prefix max, prefix min and drawdown of the block at every start"""
+    index = (np.arange(len(returns))[:, None] + np.arange(length)) % len(returns)
+    prefix = np.cumsum(returns[index], axis=1)
+    peak = np.maximum.accumulate(np.maximum(prefix, 0), axis=1)
+    return (
+        prefix[:, -1],
+        prefix.max(axis=1),
+        prefix.min(axis=1),
+        (peak - prefix).max(axis=1),
+    )
+
+
+def bootstrap_metrics(
+    returns: np.ndarray, n: int, block_size: int, rng: np.random.Generator
+) -> tuple[np.ndarray, np.ndarray]:
+    """`path_metrics` of `block_bootstrap` paths, computed on block level
+
+    Drawdowns either lie within a block or run from an earlier peak to the
+    lowest point of a block, so per block statistics are enough and each
+    path costs O(blocks) instead of O(returns).
+    """
+    length = len(returns)
+    n_blocks = -(-length // block_size)
+    last = length - (n_blocks - 1) * block_size
+    starts = rng.integers(0, length, size=(n, n_blocks))
+
+    full = _block_stats(returns, block_size)
+    tail = _block_stats(returns, last)
+    total, high, low, inner = (
+        np.concatenate([f[starts[:, :-1]], t[starts[:, -1:]]], axis=1)
+        for f, t in zip(full, tail)
+    )
+
+    start = np.cumsum(total, axis=1) - total
+    peak = np.maximum.accumulate(np.maximum(start + high, 0), axis=1)
+    previous = np.concatenate([np.zeros((n, 1), returns.dtype), peak[:, :-1]], axis=1)
+    drawdowns = np.maximum(inner, previous - start - low).max(axis=1)
+    return start[:, -1] + total[:, -1], drawdowns
+
+
+def shuffle(returns: np.ndarray, n: int, rng: np.random.Generator) -> np.ndarray:
+    """Random orderings of the same returns, the total return stays unchanged"""
+    return rng.permuted(np.broadcast_to(returns, (n, len(returns))), axis=1)
+
+
+def slippage(
+    returns: np.ndarray, n: int, cost: float, rng: np.random.Generator
+) -> np.ndarray:
+    """Returns less a random cost for entry and exit, exponential with mean `cost`"""
+    shape = (n, len(returns))
+    entry = rng.standard_exponential(shape, dtype=returns.dtype)
+    exit = rng.standard_exponential(shape, dtype=returns.dtype)
+    return returns - (entry + exit) * returns.dtype.type(cost)
+
+
+def path_metrics(paths: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Total return and maximum drawdown of each path at a fixed notional"""
+    equity = np.cumsum(paths, axis=1)
+    peak = np.maximum.accumulate(np.maximum(equity, 0), axis=1)
+    return equity[:, -1], (peak - equity).max(axis=1)
+
+
+@dataclass
+class Distribution:
+    values: np.ndarray
+
+    def quantiles(self, qs: Iterable[float] = QUANTILES) -> dict[float, float]:
+        return dict(zip(qs, np.quantile(self.values, list(qs)).tolist()))
+
+
+@dataclass
+class RobustnessReport:
+    returns: dict[str, Distribution] = field(default_factory=dict)
+    drawdowns: dict[str, Distribution] = field(default_factory=dict)
+
+    def summary(self, qs: Iterable[float] = QUANTILES) -> pd.DataFrame:
+        rows = {}
+        for method in self.returns:
+            rows[(method, "return")] = self.returns[method].quantiles(qs)
+            rows[(method, "drawdown")] = self.drawdowns[method].quantiles(qs)
+
+        return pd.DataFrame(rows).T
+
+
+def _simulate_chunk(
+    returns: np.ndarray,
+    method: str,
+    n: int,
+    seed: np.random.SeedSequence,
+    block_size: int,
+    cost: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    if method == "bootstrap":
+        return bootstrap_metrics(returns, n, block_size, rng)
+    elif method == "shuffle":
+        paths = shuffle(returns, n, rng)
+    elif method == "slippage":
+        paths = slippage(returns, n, cost, rng)
+    else:
+        raise ValueError(f"Unknown method '{method}', expected one of {METHODS}")
+
+    return path_metrics(paths)
+
+
+def _simulate_shared(
+    handle: SharedCandles, method: str, *args
+) -> tuple[np.ndarray, np.ndarray]:
+    with handle.attach() as shared:
+        return _simulate_chunk(shared["returns"], method, *args)
+
+
+def simulate(
+    returns: np.ndarray | pd.Series,
+    n_simulations: int = 10_000,
+    methods: Iterable[str] = METHODS,
+    block_size: int = 5,
+    cost: float = 0.0005,
+    workers: int | None = None,
+    seed: int | None = None,
+) -> RobustnessReport:
+    """Distributions of total return and drawdown under resampled paths
+
+    `returns` are per trade or per bar returns, simulated in float32 which is
+    plenty for quantiles and halves memory traffic. Simulations run in chunks of
+    bounded size, each with its own seed spawned from `seed`, so results do
+    not depend on the number of workers. Chunks are spread across a process
+    pool unless `workers` is 1 or there is only one chunk, workers read the
+    returns from shared memory instead of receiving a copy per chunk.
+    """
+    returns = np.asarray(returns, dtype=np.float32)
+    if len(returns) == 0:
+        raise ValueError("No returns to simulate")
+
+    methods = list(methods)
+    chunk_size = max(1, min(n_simulations, CHUNK_ELEMENTS // len(returns)))
+    sizes = [
+        min(chunk_size, n_simulations - start)
+        for start in range(0, n_simulations, chunk_size)
+    ]
+    seeds = np.random.SeedSequence(seed).spawn(len(methods) * len(sizes))
+    jobs = [
+        (method, size, seeds[i * len(sizes) + j], block_size, cost)
+        for i, method in enumerate(methods)
+        for j, size in enumerate(sizes)
+    ]
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers == 1:
+        results = [_simulate_chunk(returns, *job) for job in jobs]
+    else:
+        with (
+            CandleRegistry({"returns": returns}) as registry,
+            ProcessPoolExecutor(workers) as pool,
+        ):
+            handles = [registry.handle] * len(jobs)
+            results = list(pool.map(_simulate_shared, handles, *zip(*jobs)))
+
+    report = RobustnessReport()
+    for i, method in enumerate(methods):
+        chunks = results[i * len(sizes) : (i + 1) * len(sizes)]
+        report.returns[method] = Distribution(np.concatenate([r for r, _ in chunks]))
+        report.drawdowns[method] = Distribution(np.concatenate([d for _, d in chunks]))
+
+    return report
@@ -19,5 +19,5 @@ class Bot(ABC):
         """method will be called on shutdown"""
 
     @abstractmethod
-    async def trade(self) -> None:
+    async def trade(self, deadline: float | None = None) -> None:
         """method will be called at time interval"""
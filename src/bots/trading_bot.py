@@ -1,14 +1,30 @@
-import asyncio
+import time
+import numpy as np
 import pandas as pd
+from ccxt import Exchange
 from ta.volatility import AverageTrueRange
 from loguru import logger
 
 from src.bots.bot import Bot
+from src.market_data.resampler import CandleResampler
+from src.market_data.prices import fetch_last_prices, last_close
+from src.executions.orders import OrderExecutor, SymbolOrders
+from src.monitoring.journal import Action, TradeJournal
+from src.risk.engine import RiskEngine
+from src.monitoring.metrics import (
+    span,
+    CYCLE_SECONDS,
+    DEFERRED_SYMBOLS,
+    CANDLE_ORDER_SKEW_SECONDS,
+    LAST_CANDLE_ORDER_SKEW_SECONDS,
+    PORTFOLIO_VOLATILITY,
+)
 from src.models.trading import Trend
 from src.models.exchange import (
     MarginMode,
     Market,
     Limit,
+    MinMax,
     Precision,
     Position,
     Side,
@@ -17,7 +33,7 @@ from src.models.exchange import (
 
 
 class TradingBot(Bot):
-    def __init__(self, exchange, strategy):
+    def __init__(self, exchange, strategy, journal: TradeJournal | None = None):
         super().__init__(exchange, strategy)
         self.symbols = self.config.symbols
         self.leverage = self.config.leverage
@@ -30,6 +46,39 @@ class TradingBot(Bot):
         self.markets: dict[str, Market] = {}
         self.trends: dict[str, Trend] = {}
         self.margin_mode = MarginMode.CROSS
+        self.timeframe_seconds = Exchange.parse_timeframe(self.timeframe)
+        self.journal = journal
+        self.order_executor = OrderExecutor(exchange, journal=journal)
+
+        # Size positions on portfolio risk instead of a fixed notional
+        self.risk: RiskEngine | None = None
+        if self.config.risk is not None:
+            self.risk = RiskEngine(
+                self.symbols,
+                self.position_notional_value,
+                self.leverage,
+                **self.config.risk,
+            )
+
+        self.deferred: list[str] = []
+        self.cycle = 0
+
+        if self.config.price_source not in ("tickers", "ohlcv"):
+            raise ValueError(
+                f"Unknown price source '{self.config.price_source}', "
+                "expected 'tickers' or 'ohlcv'"
+            )
+
+        # Derive all timeframes from one base candle stream per symbol
+        self.base_timeframe = self.config.base_timeframe
+        self.resamplers: dict[str, CandleResampler] = {}
+        if self.base_timeframe:
+            timeframes = [self.timeframe, *self.config.timeframes]
+            for symbol in self.symbols:
+                self.resamplers[symbol] = CandleResampler(
+                    self.base_timeframe, timeframes
+                )
+            self.strategy.resamplers = self.resamplers
 
     async def on_start(self):
         logger.info(f"Trading symbols: {', '.join(self.symbols)}")
@@ -37,6 +86,8 @@ class TradingBot(Bot):
         logger.info(f"Leverage set to {self.leverage}x")
         logger.info(f"MarginType set to '{self.margin_mode}'")
 
+        await self.exchange.load_markets()
+
         for symbol in self.symbols:
             # Set leverage and margin-mode
             try:
@@ -48,13 +99,35 @@ class TradingBot(Bot):
             # Find limits and precision for symbol
             limits = self.exchange.markets[symbol]["limits"]
             precisions = self.exchange.markets[symbol]["precision"]
-            limit = Limit(**limits)
-            precision = Precision(**precisions)
+            limit = Limit(
+                **{
+                    key: MinMax(value.get("min"), value.get("max"))
+                    for key, value in limits.items()
+                }
+            )
+            precision = Precision(
+                amount=precisions.get("amount"),
+                price=precisions.get("price"),
+                cost=precisions.get("cost"),
+                base=precisions.get("base"),
+                quote=precisions.get("quote"),
+            )
             market = Market(symbol, limit, precision)
             self.markets[symbol] = market
             self.trends[symbol] = Trend.NONE
 
-        await self.exchange.load_markets()
+            # Seed higher timeframes once, later cycles only fetch the base
+            if resampler := self.resamplers.get(symbol):
+                for timeframe in resampler.timeframes:
+                    if timeframe == self.base_timeframe:
+                        continue
+                    ohlcv = await self.exchange.fetch_ohlcv(
+                        symbol, timeframe, limit=resampler.maxlen
+                    )
+                    resampler.seed(timeframe, ohlcv)
+
+        if self.risk is not None:
+            self.risk.set_markets(self.markets)
 
         logger.info("Startup completed")
 
@@ -62,14 +135,29 @@ class TradingBot(Bot):
         await self.trade()
 
     async def on_stop(self):
+        if self.journal is not None:
+            self.journal.close()
         logger.info("Shutdown completed")
 
-    async def trade(self):
-        logger.info("Trading bot trades ...")
+    async def trade(self, deadline: float | None = None):
+        with CYCLE_SECONDS.time():
+            await self._trade(deadline)
+
+    def _cycle_symbols(self) -> list[str]:
+        """Symbols deferred by the previous cycle go first"""
+        deferred = [symbol for symbol in self.deferred if symbol in self.symbols]
+        return deferred + [symbol for symbol in self.symbols if symbol not in deferred]
+
+    async def _trade(self, deadline: float | None = None):
+        started = time.perf_counter()
+        self.cycle += 1
+        if self.journal is not None:
+            self.journal.cycle = self.cycle
+        logger.debug("Trading bot trades ...")
 
-        orders_open: list[dict] = []
-        orders_close: list[dict] = []
-        open_positions: list[dict] = await self.exchange.fetch_positions()
+        symbol_orders: list[SymbolOrders] = []
+        with span("fetch"):
+            open_positions: list[dict] = await self.exchange.fetch_positions()
         open_positions_lookup: dict[str, Position] = {}
 
         # Trading logic for all symbols
@@ -82,59 +170,128 @@ class TradingBot(Bot):
             position = Position(symbol, side, size, entry_price, mark_price)
             open_positions_lookup[symbol] = position
 
-        for symbol in self.symbols:
-            logger.info(f"Trade {symbol=}")
+        frames: dict[str, pd.DataFrame] = {}
+        symbols = self._cycle_symbols()
+        self.deferred = []
 
-            # Fetch current market price
-            try:
-                ticker = await self.exchange.fetch_ticker(symbol)
-                current_price = ticker["last"]
-            except Exception as e:
-                logger.error(f"Ticker could not be fetched: {str(e)}")
-                raise e
+        # Current market prices of all symbols in a single request
+        prices: dict[str, float] = {}
+        if self.config.price_source == "tickers":
+            with span("fetch"):
+                try:
+                    prices = await fetch_last_prices(self.exchange, symbols)
+                except Exception as e:
+                    logger.error(f"Tickers could not be fetched: {str(e)}")
+                    raise e
 
-            # Fetch OHLCV
-            try:
-                limit = 1500
-                ohlcv = await self.exchange.fetch_ohlcv(
-                    symbol, self.timeframe, limit=limit
-                )
-            except Exception as e:
-                logger.error(f"OHLCV data could not be fetched: {str(e)}")
-                raise e
+        for i, symbol in enumerate(symbols):
+            # Past the deadline, leave the remaining symbols to the next cycle
+            if deadline is not None and time.time() > deadline:
+                self.deferred = symbols[i:]
+                for deferred in self.deferred:
+                    DEFERRED_SYMBOLS.inc(symbol=deferred)
+                logger.warning(f"Cycle deadline passed, deferred {self.deferred}")
+                break
+
+            logger.debug(f"Fetch {symbol=}")
+
+            with span("fetch", symbol):
+                # Fetch OHLCV, only the missing base candles when resampling
+                resampler = self.resamplers.get(symbol)
+                try:
+                    if resampler:
+                        ohlcv = await self.exchange.fetch_ohlcv(
+                            symbol,
+                            self.base_timeframe,
+                            limit=resampler.missing(int(time.time() * 1000)),
+                        )
+                    else:
+                        limit = 1500
+                        ohlcv = await self.exchange.fetch_ohlcv(
+                            symbol, self.timeframe, limit=limit
+                        )
+                except Exception as e:
+                    logger.error(f"OHLCV data could not be fetched: {str(e)}")
+                    raise e
 
             # Turn OHLCV into Pandas dataframe
-            cols = ["timestamp", "open", "high", "low", "close", "volume"]
-            df_ohlcv = pd.DataFrame(ohlcv, columns=cols)
-            df_ohlcv["datetime"] = pd.to_datetime(df_ohlcv["timestamp"], unit="ms")
+            with span("parse", symbol):
+                if resampler:
+                    resampler.update(ohlcv)
+                    df_ohlcv = resampler.frame(self.timeframe)
+                else:
+                    cols = ["timestamp", "open", "high", "low", "close", "volume"]
+                    df_ohlcv = pd.DataFrame(ohlcv, columns=cols)
+                    df_ohlcv["datetime"] = pd.to_datetime(
+                        df_ohlcv["timestamp"], unit="ms"
+                    )
+                frames[symbol] = df_ohlcv
+                if symbol not in prices:
+                    prices[symbol] = last_close(df_ohlcv)
+
+        # Determine current market trend of all symbols at once
+        with span("strategy"):
+            closes = {
+                symbol: df.set_index("timestamp")["close"]
+                for symbol, df in frames.items()
+            }
+            current_trends = self.strategy.current_trends(closes)
+
+        if self.risk is not None:
+            with span("risk"):
+                self.risk.update(closes)
+
+        entries: dict[str, Trend] = {}
+        for symbol in frames:
+            logger.debug(f"Trade {symbol=}")
+            current_price = prices[symbol]
+            current_trend = current_trends[symbol]
 
             if position := open_positions_lookup.get(symbol):
                 position_trend = Trend.UP if position.long else Trend.DOWN
-                logger.info(f"Open position is long: {position.long}")
             else:
                 position_trend = Trend.NONE
-                logger.info("No open position")
 
-            # Determine current market trend
-            current_trend = self.strategy.current_trend(df_ohlcv["close"])
-            logger.info(f"Position trend: {position_trend}")
-            logger.info(f"Market trend: {current_trend}")
-            logger.info(f"Trend progression: {position_trend} -> {current_trend}")
-            logger.info(f"Current price: {current_price}")
+            logger.debug(
+                f"Trend progression: {position_trend} -> {current_trend} "
+                f"at price {current_price}"
+            )
 
             # No strong trend could be detected
             if current_trend == Trend.NONE:
-                logger.info(f"Continue: No market trend detected: {current_trend}")
+                action = Action.NO_TREND
+            # If no change in trend is occuring, don't do anything
+            elif current_trend == position_trend:
+                action = Action.IN_LINE
+            else:
+                action = Action.REVERSE if position else Action.OPEN
+
+            if self.journal is not None:
+                self.journal.decision(
+                    symbol, position_trend, current_trend, current_price, action
+                )
+
+            if action in (Action.NO_TREND, Action.IN_LINE):
+                logger.debug(f"Continue: {action.name}")
                 continue
 
-            # If no change in trend is occuring, don't do anything
-            if current_trend == position_trend:
-                logger.info("Continue: Position trend in line with market trend")
+            entries[symbol] = current_trend
+
+        sizes = self.position_sizes(entries, prices, open_positions_lookup)
+
+        for symbol, current_trend in entries.items():
+            if not sizes[symbol]:
+                logger.debug(f"Continue: No risk budget left for {symbol}")
                 continue
 
+            df_ohlcv = frames[symbol]
+            current_price = prices[symbol]
+            position = open_positions_lookup.get(symbol)
             side = Side.BUY if current_trend == Trend.UP else Side.SELL
-            size = self.position_notional_value / current_price
-            amount = self.exchange.amount_to_precision(symbol, size)
+            amount = self.exchange.amount_to_precision(symbol, sizes[symbol])
+
+            orders = SymbolOrders(symbol)
+            symbol_orders.append(orders)
 
             # New order
             new_order = {
@@ -143,15 +300,10 @@ class TradingBot(Bot):
                 "side": side,
                 "amount": amount,
             }
-            orders_open.append(new_order)
+            orders.open.append(new_order)
 
-            atr_indicator = AverageTrueRange(
-                df_ohlcv["high"], df_ohlcv["low"], df_ohlcv["close"]
-            )
-            atrs = atr_indicator.average_true_range()
-            atrs_mean = atrs.tail(self.window).mean()
-            stop_loss = self.atr_stop_loss * atrs_mean / current_price
-            call_back_rate = min(max(round(stop_loss * 100, 1), 0.1), 10)
+            with span("atr", symbol):
+                call_back_rate = self.callback_rate(df_ohlcv, current_price)
 
             # Trailing stop-loss order
             stop_loss_order = {
@@ -164,24 +316,82 @@ class TradingBot(Bot):
                     "reduceOnly": True,
                 },
             }
-            orders_open.append(stop_loss_order)
+            orders.open.append(stop_loss_order)
 
             # Add order for position which needs to be closed
             if position:
-                close_order = {
+                orders.close = {
                     "symbol": position.symbol,
                     "type": OrderType.MARKET,
                     "side": Side.SELL if position.long else Side.BUY,
                     "amount": position.size,
                 }
-                orders_close.append(close_order)
 
+        failed = 0
         if self.config.enable_trading:
-            async with asyncio.TaskGroup() as tg:
-                for order in orders_close:
-                    tg.create_task(self.exchange.create_order(**order))
-                    tg.create_task(self.exchange.cancel_all_orders(order["symbol"]))
-
-            async with asyncio.TaskGroup() as tg:
-                for order in orders_open:
-                    tg.create_task(self.exchange.create_order(**order))
+            report = await self.order_executor.execute(symbol_orders)
+            failed = len(report.failed)
+            self._record_candle_order_skew()
+
+        logger.info(
+            f"Cycle {self.cycle} traded {len(frames)} symbols: "
+            f"{len(symbol_orders)} signals, {failed} failed, "
+            f"{len(self.deferred)} deferred in {time.perf_counter() - started:.3f}s"
+        )
+
+    def position_sizes(
+        self,
+        entries: dict[str, Trend],
+        prices: dict[str, float],
+        positions: dict[str, Position],
+    ) -> dict[str, float]:
+        """Amounts of the new positions, a fixed notional without a risk engine"""
+        if self.risk is None:
+            return {
+                symbol: self.position_notional_value / prices[symbol]
+                for symbol in entries
+            }
+
+        index = self.risk.index
+        signals = np.zeros(len(index))
+        price_vector = np.full(len(index), np.nan)
+        held = np.zeros(len(index))
+        for symbol, price in prices.items():
+            price_vector[index[symbol]] = price
+        for symbol, trend in entries.items():
+            signals[index[symbol]] = 1 if trend == Trend.UP else -1
+
+        # Positions which are not reversed keep counting towards the limits
+        for symbol, position in positions.items():
+            if symbol in index and symbol not in entries:
+                price = position.mark_price or position.entry_price
+                direction = 1 if position.long else -1
+                held[index[symbol]] = direction * position.size * price
+
+        notionals = self.risk.target_notionals(signals, price_vector, held)
+        PORTFOLIO_VOLATILITY.set(self.risk.portfolio_volatility(held + notionals))
+        return {
+            symbol: abs(notionals[index[symbol]]) / prices[symbol] for symbol in entries
+        }
+
+    def callback_rate(self, df_ohlcv: pd.DataFrame, current_price: float) -> float:
+        """Trailing stop callback rate in percent derived from the mean ATR"""
+        atr_indicator = AverageTrueRange(
+            df_ohlcv["high"], df_ohlcv["low"], df_ohlcv["close"]
+        )
+        atrs = atr_indicator.average_true_range()
+        atrs_mean = atrs.tail(self.window).mean()
+        stop_loss = self.atr_stop_loss * atrs_mean / current_price
+        return min(max(round(stop_loss * 100, 1), 0.1), 10)
+
+    def _record_candle_order_skew(self) -> None:
+        """Record the delay between the latest candle close and the first order"""
+        first_order_at = self.order_executor.first_order_at
+        if first_order_at is None:
+            return
+
+        candle_close = first_order_at // self.timeframe_seconds
+        skew = first_order_at - candle_close * self.timeframe_seconds
+        CANDLE_ORDER_SKEW_SECONDS.observe(skew)
+        LAST_CANDLE_ORDER_SKEW_SECONDS.set(skew)
+        logger.info(f"Candle close to first order skew: {skew:.3f}s")
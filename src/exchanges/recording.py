@@ -0,0 +1,173 @@
+import json
+import time
+import asyncio
+import inspect
+import ccxt
+from collections import defaultdict, deque
+from pathlib import Path
+from loguru import logger
+
+
+def _key(method: str, args: list, kwargs: dict) -> str:
+    return json.dumps([method, args, kwargs], sort_keys=True, default=str)
+
+
+def _camel_case(method: str) -> str:
+    first, *rest = method.split("_")
+    return first + "".join(word.capitalize() for word in rest)
+
+
+def _normalize(value):
+    """Round-trip a value through JSON so recorded and live calls compare equal"""
+    return json.loads(json.dumps(value, default=str))
+
+
+class RecordingExchange:
+    """Proxy around a ccxt exchange which appends every call to a JSON lines file
+
+    Each line holds the method, arguments, offset from the start of the
+    recording, latency and either the response or the raised error.
+    """
+
+    def __init__(self, exchange, path: str | Path) -> None:
+        self.exchange = exchange
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("a")
+        self._start = time.monotonic()
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.exchange, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        if inspect.iscoroutinefunction(attr):
+
+            async def record_async(*args, **kwargs):
+                start = time.monotonic()
+                try:
+                    result = await attr(*args, **kwargs)
+                except Exception as e:
+                    self._write(name, "a", args, kwargs, start, error=e)
+                    raise e
+
+                self._write(name, "a", args, kwargs, start, result=result)
+                return result
+
+            return record_async
+
+        def record_sync(*args, **kwargs):
+            start = time.monotonic()
+            try:
+                result = attr(*args, **kwargs)
+            except Exception as e:
+                self._write(name, "s", args, kwargs, start, error=e)
+                raise e
+
+            self._write(name, "s", args, kwargs, start, result=result)
+            return result
+
+        return record_sync
+
+    def _write(self, method, kind, args, kwargs, start, result=None, error=None):
+        record = {
+            "m": method,
+            "c": kind,
+            "a": list(args),
+            "k": kwargs,
+            "t": round(start - self._start, 6),
+            "d": round(time.monotonic() - start, 6),
+        }
+        if error is not None:
+            record["e"] = [type(error).__name__, str(error)]
+        else:
+            record["r"] = result
+
+        self._file.write(json.dumps(record, separators=(",", ":"), default=str))
+        self._file.write("\n")
+        self._file.flush()
+
+    async def close(self) -> None:
+        self._file.close()
+        if close := getattr(self.exchange, "close", None):
+            await close()
+
+
+class ReplayExchange:
+    """Serve a recording made by RecordingExchange back without any network
+
+    Calls are matched on method and arguments and answered in recorded order,
+    repeating the last answer once a call has been used up. With speed 1.0
+    every call takes its recorded latency, larger values replay accelerated
+    and None answers as fast as possible.
+    """
+
+    def __init__(self, path: str | Path, speed: float | None = 1.0) -> None:
+        self.path = Path(path)
+        self.speed = speed
+        self.markets: dict = {}
+        self.calls: dict[str, int] = defaultdict(int)
+
+        self._kinds: dict[str, str] = {}
+        self._records: dict[str, deque] = defaultdict(deque)
+        self._last: dict[str, dict] = {}
+
+        with self.path.open() as f:
+            for line in f:
+                if not line.strip():
+                    continue
+
+                record = json.loads(line)
+                self._kinds[record["m"]] = record["c"]
+                key = _key(record["m"], record["a"], record["k"])
+                self._records[key].append(record)
+                if record["m"] == "load_markets" and "r" in record:
+                    self.markets = self.markets or record["r"]
+
+        # Advertise the capabilities the recorded session made use of
+        self.has = {_camel_case(method): True for method in self._kinds}
+
+        logger.info(f"Loaded {sum(map(len, self._records.values()))} recorded calls")
+
+    def __getattr__(self, name: str):
+        kind = self.__dict__.get("_kinds", {}).get(name)
+        if kind is None:
+            raise AttributeError(f"No recorded calls for '{name}'")
+
+        if kind == "a":
+
+            async def replay_async(*args, **kwargs):
+                record = self._next(name, args, kwargs)
+                if self.speed:
+                    await asyncio.sleep(record["d"] / self.speed)
+                return self._answer(record)
+
+            return replay_async
+
+        def replay_sync(*args, **kwargs):
+            return self._answer(self._next(name, args, kwargs))
+
+        return replay_sync
+
+    def _next(self, method: str, args: tuple, kwargs: dict) -> dict:
+        key = _key(method, _normalize(list(args)), _normalize(kwargs))
+        self.calls[method] += 1
+        if records := self._records.get(key):
+            self._last[key] = records.popleft()
+        if record := self._last.get(key):
+            return record
+
+        raise KeyError(f"No recorded response for {method}{tuple(args)} {kwargs}")
+
+    def _answer(self, record: dict):
+        if "e" in record:
+            name, message = record["e"]
+            error_cls = getattr(ccxt, name, None)
+            if not (isinstance(error_cls, type) and issubclass(error_cls, Exception)):
+                error_cls = RuntimeError
+            raise error_cls(message)
+
+        return record["r"]
+
+    async def close(self) -> None:
+        pass
@@ -1,3 +1,6 @@
+import os
+import signal
+import functools
 import uvloop
 import asyncio
 from loguru import logger
@@ -6,6 +9,9 @@ from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
 
 from src.bots.trading_bot import TradingBot
+from src.executions.schedule import CandleCloseScheduler
+from src.monitoring.metrics import MetricsServer
+from src.monitoring.profiler import CycleProfiler
 
 uvloop.install()
 asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
@@ -16,6 +22,34 @@ class BotExecutor:
         self.bot = bot
         self.bot_name = bot.__class__.__name__
         self.scheduler = AsyncIOScheduler({"apscheduler.timezone": "UTC"})
+        self.candle_scheduler: CandleCloseScheduler | None = None
+        if (offset := bot.config.candle_close_offset) is not None:
+            self.candle_scheduler = CandleCloseScheduler(
+                self.trade, bot.timeframe, offset, bot.config.cycle_deadline
+            )
+        self.metrics_server = MetricsServer()
+        self.metrics_server.route("POST", "/profile", self._profile_request)
+        self.profiler = CycleProfiler(os.getenv("PROFILE_DIR", "profiles"))
+
+    def profile(self, cycles: int = 1):
+        """Profile the next trade cycles"""
+        self.profiler.arm(cycles)
+
+    async def trade(self, deadline: float | None = None):
+        await self.profiler.run(
+            functools.partial(self.bot.trade, deadline),
+            strategy=self.bot.strategy.__class__.__name__,
+            symbols=len(self.bot.symbols),
+        )
+
+    async def _profile_request(self, query: dict[str, str]) -> tuple[int, str]:
+        try:
+            cycles = int(query.get("cycles", 1))
+        except ValueError:
+            return 400, "cycles must be an integer\n"
+
+        self.profile(cycles)
+        return 200, f"Profiling the next {cycles} trade cycle(s)\n"
 
     def run(self):
         asyncio.run(self._run())
@@ -33,8 +67,22 @@ class BotExecutor:
 
     async def _startup(self):
         logger.info(f"Starting bot {self.bot_name}")
+        await self.metrics_server.start()
+        if cycles := _env_int("PROFILE_CYCLES", 0):
+            self.profile(cycles)
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGUSR1, self.profile, _env_int("PROFILE_SIGNAL_CYCLES", 1)
+        )
         await self.bot.on_start()
 
+        if self.candle_scheduler is not None:
+            self.candle_scheduler.start()
+            logger.info(
+                f"Candle close scheduler started for {self.bot_name} at "
+                f"{self.bot.timeframe} + {self.candle_scheduler.offset}s"
+            )
+            return
+
         rate = self.bot.config.rate
         is_crontab = not rate.replace(".", "", 1).isdigit()
         trigger = (
@@ -42,13 +90,34 @@ class BotExecutor:
             if is_crontab
             else IntervalTrigger(seconds=int(rate))
         )
-        self.scheduler.add_job(self.bot.trade, trigger, name="Trade loop")
+        self.scheduler.add_job(
+            self.trade,
+            trigger,
+            name="Trade loop",
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=None,
+        )
         self.scheduler.start()
         logger.info(f"Scheduler started for {self.bot_name}")
 
     async def _shutdown(self):
         logger.info(f"Bot stopping {self.bot_name}")
-        await self.bot.on_stop()
+        # No cycle may start once the bot released its resources
         if self.scheduler.running:
             self.scheduler.shutdown(wait=False)
+        if self.candle_scheduler is not None:
+            await self.candle_scheduler.stop()
         logger.info(f"Scheduler stopped for {self.bot_name}")
+        await self.bot.on_stop()
+        await self.metrics_server.stop()
+
+
+def _env_int(name: str, default: int) -> int:
+    """Integer environment variable, a malformed value falls back to default"""
+    value = os.getenv(name, str(default))
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"{name} must be an integer, got '{value}', using {default}")
+        return default
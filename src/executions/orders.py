@@ -0,0 +1,183 @@
+import time
+import asyncio
+import ccxt
+from dataclasses import dataclass, field
+from loguru import logger
+
+from src.monitoring.journal import TradeJournal
+from src.monitoring.metrics import span
+
+BATCH_SIZE = 5
+
+# Binance only accepts plain orders in batchOrders, stops go one by one
+CONDITIONAL_PARAMS = (
+    "callbackRate",
+    "stopPrice",
+    "triggerPrice",
+    "stopLossPrice",
+    "takeProfitPrice",
+    "trailingPercent",
+)
+
+
+@dataclass
+class SymbolOrders:
+    """Orders of one symbol, the close is filled before any open is sent"""
+
+    symbol: str
+    close: dict | None = None
+    open: list[dict] = field(default_factory=list)
+
+
+@dataclass
+class ExecutionReport:
+    orders: list[dict] = field(default_factory=list)
+    failed: dict[str, Exception] = field(default_factory=dict)
+
+
+class OrderBatcher:
+    """Collect orders submitted in the same event loop step into batch requests
+
+    Pipelines of different symbols which reach the same stage together end up
+    in one `create_orders` request of at most `batch_size` orders. Every
+    order resolves on its own, so a rejected order only fails its submitter.
+    """
+
+    def __init__(self, exchange, batch_size: int = BATCH_SIZE) -> None:
+        self.exchange = exchange
+        self.batch_size = batch_size
+        self.enabled = bool(getattr(exchange, "has", {}).get("createOrders"))
+        self._pending: list[tuple[dict, asyncio.Future]] = []
+        self._scheduled = False
+        self._tasks: set[asyncio.Task] = set()
+
+    def batchable(self, order: dict) -> bool:
+        params = order.get("params") or {}
+        return self.enabled and not any(key in params for key in CONDITIONAL_PARAMS)
+
+    async def submit(self, order: dict) -> dict:
+        if not self.batchable(order):
+            return _checked(await self.exchange.create_order(**order))
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((order, future))
+        if not self._scheduled:
+            self._scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        pending, self._pending = self._pending, []
+        self._scheduled = False
+        for i in range(0, len(pending), self.batch_size):
+            task = asyncio.ensure_future(self._send(pending[i : i + self.batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: list[tuple[dict, asyncio.Future]]) -> None:
+        # ccxt reads batch entries with safe_string, which skips StrEnum values
+        orders = [
+            {**order, "type": str(order["type"]), "side": str(order["side"])}
+            for order, _ in batch
+        ]
+        try:
+            if len(orders) == 1:
+                results = [await self.exchange.create_order(**orders[0])]
+            else:
+                results = await self.exchange.create_orders(orders)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            try:
+                future.set_result(_checked(result))
+            except ccxt.ExchangeError as e:
+                future.set_exception(e)
+
+        # A short response must not leave submitters waiting forever
+        for _, future in batch[len(results) :]:
+            if not future.done():
+                future.set_exception(
+                    ccxt.ExchangeError("Order missing from the batch response")
+                )
+
+
+def _checked(result: dict) -> dict:
+    """Raise for rejected entries, which batch responses return inline"""
+    if result and result.get("id") is not None:
+        return result
+
+    info = (result or {}).get("info") or {}
+    raise ccxt.ExchangeError(
+        f"Order rejected: {info.get('code', '')} {info.get('msg', 'no order id')}"
+    )
+
+
+class OrderExecutor:
+    """Send the orders of every symbol as an independent close → cancel → open chain
+
+    A symbol only waits for its own requests, never for the slowest symbol
+    of a global phase. Plain orders are batched via `OrderBatcher`. A failed
+    close or entry aborts the rest of that symbol's chain, other symbols
+    continue.
+    """
+
+    def __init__(
+        self,
+        exchange,
+        batch_size: int = BATCH_SIZE,
+        journal: TradeJournal | None = None,
+    ) -> None:
+        self.exchange = exchange
+        self.batcher = OrderBatcher(exchange, batch_size)
+        self.journal = journal
+        self.first_order_at: float | None = None
+
+    async def execute(self, symbol_orders: list[SymbolOrders]) -> ExecutionReport:
+        self.first_order_at = None
+        report = ExecutionReport()
+
+        async with asyncio.TaskGroup() as tg:
+            for orders in symbol_orders:
+                tg.create_task(self._pipeline(orders, report))
+
+        return report
+
+    async def _pipeline(self, orders: SymbolOrders, report: ExecutionReport) -> None:
+        symbol = orders.symbol
+        try:
+            # Keep the old stop in place until the position is closed
+            if orders.close is not None:
+                report.orders.append(await self._submit(orders.close))
+                await self.exchange.cancel_all_orders(symbol)
+
+            for order in orders.open:
+                report.orders.append(await self._submit(order))
+        except Exception as e:
+            logger.error(f"Orders for {symbol} failed: {str(e)}")
+            report.failed[symbol] = e
+
+    async def _submit(self, order: dict) -> dict:
+        if self.first_order_at is None:
+            self.first_order_at = time.time()
+
+        if self.journal is not None:
+            self.journal.order(order)
+
+        with span("order", order["symbol"]):
+            try:
+                result = await self.batcher.submit(order)
+            except Exception:
+                if self.journal is not None:
+                    self.journal.error(order)
+                raise
+
+        if self.journal is not None:
+            self.journal.fill(order, result)
+        return result
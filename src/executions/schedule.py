@@ -1,13 +1,91 @@
+import time
 import asyncio
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
+from loguru import logger
 
+from src.market_data.resampler import WEEK_OFFSET_MS, timeframe_ms
+from src.monitoring.metrics import MISSED_RUNS, SCHEDULE_LATENESS_SECONDS
 
-class AsyncScheduler:
-    def __init__(self):
-        self.tasks = []
+Job = Callable[[float | None], Awaitable]
 
-    def schedule(self, task: Callable, *args, **kwargs):
-        self.tasks.append((task, args, kwargs))
 
-    async def run(self):
-        await asyncio.gather(*(asyncio.create_task(task(*args, **kwargs)) for task, args, kwargs in self.tasks))
+class CandleCloseScheduler:
+    """Run a job at every candle close plus an offset, one run at a time
+
+    Fire times are derived from the candle grid of the exchange, so they
+    never drift like interval triggers. A run never overlaps the next one,
+    fire times which passed while a run was still busy are coalesced into a
+    single immediate run. The lateness of every start is recorded, and the
+    job receives the absolute time after which it should defer remaining
+    work, `offset + deadline` seconds after the candle close.
+    """
+
+    def __init__(
+        self,
+        job: Job,
+        timeframe: str,
+        offset: float = 0.0,
+        deadline: float | None = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], Awaitable] = asyncio.sleep,
+    ) -> None:
+        self.job = job
+        self.period = timeframe_ms(timeframe) / 1000
+        self.origin = WEEK_OFFSET_MS / 1000 if timeframe.endswith("w") else 0.0
+        self.offset = offset
+        self.deadline = deadline
+        self.clock = clock
+        self.sleep = sleep
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def next_fire(self, now: float) -> float:
+        """First candle close plus offset strictly after `now`"""
+        closes = (now - self.offset - self.origin) // self.period + 1
+        return closes * self.period + self.origin + self.offset
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        fire = self.next_fire(self.clock())
+        while True:
+            while (remaining := fire - self.clock()) > 0:
+                await self.sleep(remaining)
+
+            lateness = self.clock() - fire
+            SCHEDULE_LATENESS_SECONDS.observe(lateness)
+            logger.info(f"Trade cycle started {lateness:.3f}s after schedule")
+
+            deadline = fire + self.deadline if self.deadline is not None else None
+            try:
+                await self.job(deadline)
+            except Exception as e:
+                logger.error(f"Scheduled job failed: {str(e)}")
+
+            fire = self._coalesce(fire + self.period)
+
+    def _coalesce(self, fire: float) -> float:
+        """Replace fire times which already passed by the latest of them"""
+        now = self.clock()
+        if fire > now:
+            return fire
+
+        latest = self.next_fire(now) - self.period
+        if missed := round((latest - fire) / self.period):
+            MISSED_RUNS.inc(missed)
+            logger.warning(f"Trade cycle overran, coalesced {missed} missed run(s)")
+
+        return latest
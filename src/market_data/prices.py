@@ -0,0 +1,31 @@
+import pandas as pd
+from loguru import logger
+
+
+async def fetch_last_prices(exchange, symbols: list[str]) -> dict[str, float]:
+    """Last traded prices of all symbols, in one request where supported"""
+    if not symbols:
+        return {}
+
+    if getattr(exchange, "has", {}).get("fetchTickers"):
+        tickers = await exchange.fetch_tickers(symbols)
+        prices = {
+            symbol: tickers[symbol]["last"]
+            for symbol in symbols
+            if tickers.get(symbol, {}).get("last") is not None
+        }
+        if missing := [symbol for symbol in symbols if symbol not in prices]:
+            logger.warning(f"No ticker for {missing}, using the latest close")
+        return prices
+
+    prices = {}
+    for symbol in symbols:
+        ticker = await exchange.fetch_ticker(symbol)
+        prices[symbol] = ticker["last"]
+
+    return prices
+
+
+def last_close(df_ohlcv: pd.DataFrame) -> float:
+    """Close of the latest, possibly still forming, candle"""
+    return float(df_ohlcv["close"].iloc[-1])
@@ -0,0 +1,148 @@
+import pandas as pd
+from collections import deque
+from ccxt import Exchange
+
+COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+# Binance weeks start on Monday, the epoch was a Thursday
+WEEK_OFFSET_MS = 4 * 86_400_000
+
+
+def timeframe_ms(timeframe: str) -> int:
+    if timeframe.endswith("M"):
+        raise ValueError(f"Timeframe '{timeframe}' has no fixed duration")
+
+    return int(Exchange.parse_timeframe(timeframe) * 1000)
+
+
+def _merge(candle: list, other: list) -> list:
+    return [
+        candle[0],
+        candle[1],
+        max(candle[2], other[2]),
+        min(candle[3], other[3]),
+        other[4],
+        candle[5] + other[5],
+    ]
+
+
+class _Buffer:
+    def __init__(self, timeframe: str, maxlen: int) -> None:
+        self.duration = timeframe_ms(timeframe)
+        self.offset = WEEK_OFFSET_MS if timeframe.endswith("w") else 0
+        self.closed: deque[list] = deque(maxlen=maxlen)
+        self.partial: list | None = None
+
+    def bucket(self, timestamp: int) -> int:
+        return (timestamp - self.offset) // self.duration * self.duration + self.offset
+
+    def commit(self, candle: list) -> None:
+        bucket = self.bucket(candle[0])
+        if self.closed and bucket <= self.closed[-1][0]:
+            return
+
+        if self.partial is not None and bucket == self.partial[0]:
+            self.partial = _merge(self.partial, candle)
+            return
+
+        if self.partial is not None:
+            self.closed.append(self.partial)
+            self.partial = None
+
+        # A bucket whose first base candle is missing would be incomplete
+        if candle[0] == bucket:
+            self.partial = [bucket, *candle[1:]]
+
+    def rows(self, forming: list | None) -> list[list]:
+        rows = list(self.closed)
+        partial = self.partial
+        if forming is not None:
+            bucket = self.bucket(forming[0])
+            latest = partial or (rows[-1] if rows else None)
+            if partial is not None and bucket == partial[0]:
+                partial = _merge(partial, forming)
+            elif forming[0] == bucket and (latest is None or bucket > latest[0]):
+                if partial is not None:
+                    rows.append(partial)
+                partial = [bucket, *forming[1:]]
+
+        if partial is not None:
+            rows.append(partial)
+
+        return rows
+
+
+class CandleResampler:
+    """Derive candles of several timeframes from a single base candle stream
+
+    Feed the latest base candles of a symbol to `update` on every cycle. All
+    candles but the last one are committed to rolling per-timeframe buffers,
+    the last one may still be forming and is only merged into the view
+    returned by `frame`. Higher timeframes can be seeded with history once, so
+    they are complete from the start while later cycles only need the base
+    stream.
+    """
+
+    def __init__(
+        self, base_timeframe: str, timeframes: list[str], maxlen: int = 1500
+    ) -> None:
+        self.base_timeframe = base_timeframe
+        self.base_duration = timeframe_ms(base_timeframe)
+        self.maxlen = maxlen
+        self.buffers: dict[str, _Buffer] = {}
+        for timeframe in {base_timeframe, *timeframes}:
+            if timeframe_ms(timeframe) % self.base_duration:
+                raise ValueError(
+                    f"Timeframe '{timeframe}' is not a multiple of '{base_timeframe}'"
+                )
+            self.buffers[timeframe] = _Buffer(timeframe, maxlen)
+
+        self.last_timestamp: int | None = None
+        self.forming: list | None = None
+
+    @property
+    def timeframes(self) -> list[str]:
+        return list(self.buffers)
+
+    def seed(self, timeframe: str, ohlcv: list[list]) -> None:
+        """Preload closed candles of a timeframe, the last candle is dropped
+
+        The base stream has to start at or before the bucket of the dropped
+        candle, otherwise that bucket is incomplete and left out.
+        """
+        buffer = self.buffers[timeframe]
+        for candle in ohlcv[:-1]:
+            buffer.closed.append([int(candle[0]), *map(float, candle[1:6])])
+
+    def missing(self, now_ms: int) -> int:
+        """Number of base candles to fetch to catch up until now"""
+        if self.last_timestamp is None:
+            return self.maxlen
+
+        return min(
+            (now_ms - self.last_timestamp) // self.base_duration + 2, self.maxlen
+        )
+
+    def update(self, ohlcv: list[list]) -> None:
+        if not ohlcv:
+            return
+
+        candles = [[int(c[0]), *map(float, c[1:6])] for c in ohlcv]
+        for candle in candles[:-1]:
+            if self.last_timestamp is not None and candle[0] <= self.last_timestamp:
+                continue
+
+            for buffer in self.buffers.values():
+                buffer.commit(candle)
+            self.last_timestamp = candle[0]
+
+        if self.last_timestamp is None or candles[-1][0] > self.last_timestamp:
+            self.forming = candles[-1]
+        else:
+            self.forming = None
+
+    def frame(self, timeframe: str) -> pd.DataFrame:
+        rows = self.buffers[timeframe].rows(self.forming)
+        df_ohlcv = pd.DataFrame(rows[-self.maxlen :], columns=COLUMNS)
+        df_ohlcv["datetime"] = pd.to_datetime(df_ohlcv["timestamp"], unit="ms")
+        return df_ohlcv
@@ -0,0 +1,140 @@
+import sys
+import numpy as np
+import pandas as pd
+from collections.abc import Mapping
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+
+from src.market_data.resampler import COLUMNS
+
+# Keep every array cache line aligned within the block
+ALIGNMENT = 64
+
+
+@dataclass(frozen=True)
+class SharedCandles:
+    """Picklable handle to arrays published by a `CandleRegistry`
+
+    Only the block name and the layout travel between processes, the data
+    stays in shared memory.
+    """
+
+    name: str
+    layout: dict[str, tuple[int, tuple[int, ...], str]]
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self.layout)
+
+    def attach(self) -> "AttachedCandles":
+        # Before 3.13 attaching also registers the block with the resource
+        # tracker, harmless for pool workers as they share the owner's one
+        if sys.version_info >= (3, 13):
+            shm = SharedMemory(self.name, track=False)
+        else:
+            shm = SharedMemory(self.name)
+        return AttachedCandles(self, shm)
+
+
+def _array(shm: SharedMemory, entry: tuple[int, tuple[int, ...], str]) -> np.ndarray:
+    # frombuffer holds a buffer export, so the block cannot close under a view
+    offset, shape, dtype = entry
+    count = int(np.prod(shape))
+    array = np.frombuffer(shm.buf, dtype=dtype, count=count, offset=offset)
+    return array.reshape(shape)
+
+
+def _view(shm: SharedMemory, entry: tuple[int, tuple[int, ...], str]) -> np.ndarray:
+    array = _array(shm, entry)
+    array.flags.writeable = False
+    return array
+
+
+def _frame(array: np.ndarray) -> pd.DataFrame:
+    df_ohlcv = pd.DataFrame(array, columns=COLUMNS, copy=False)
+    df_ohlcv["datetime"] = pd.to_datetime(df_ohlcv["timestamp"], unit="ms")
+    return df_ohlcv
+
+
+class AttachedCandles:
+    """Read-only views onto a published block, without copying
+
+    Views must not outlive the attachment, `close` raises `BufferError`
+    while any of them or a frame built on them is still referenced.
+    """
+
+    def __init__(self, handle: SharedCandles, shm: SharedMemory) -> None:
+        self.handle = handle
+        self._shm = shm
+
+    def __getitem__(self, symbol: str) -> np.ndarray:
+        return _view(self._shm, self.handle.layout[symbol])
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        return _frame(self[symbol])
+
+    def close(self) -> None:
+        self._shm.close()
+
+    def __enter__(self) -> "AttachedCandles":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class CandleRegistry:
+    """Publish per-symbol OHLCV arrays once into a single shared memory block
+
+    DataFrames are stored as float64 arrays of `COLUMNS`, arrays as they are.
+    Pass `handle` to other processes, they attach to read-only views, so fan
+    out costs no copies and memory does not grow with the number of workers.
+    The owner unlinks the block on `close`, which like `AttachedCandles.close`
+    raises `BufferError` while its own views or frames are referenced.
+    Attached processes keep their mapping until they close it themselves.
+    """
+
+    def __init__(self, arrays: Mapping[str, pd.DataFrame | np.ndarray]) -> None:
+        prepared = {
+            symbol: (
+                data[COLUMNS].to_numpy(dtype=np.float64)
+                if isinstance(data, pd.DataFrame)
+                else np.ascontiguousarray(data)
+            )
+            for symbol, data in arrays.items()
+        }
+
+        layout = {}
+        size = 0
+        for symbol, array in prepared.items():
+            size = -(-size // ALIGNMENT) * ALIGNMENT
+            layout[symbol] = (size, array.shape, array.dtype.str)
+            size += array.nbytes
+
+        self._shm = SharedMemory(create=True, size=max(size, 1))
+        self.handle = SharedCandles(self._shm.name, layout)
+
+        for symbol, array in prepared.items():
+            target = _array(self._shm, layout[symbol])
+            target[...] = array
+            del target
+
+    @property
+    def nbytes(self) -> int:
+        return self._shm.size
+
+    def __getitem__(self, symbol: str) -> np.ndarray:
+        return _view(self._shm, self.handle.layout[symbol])
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        return _frame(self[symbol])
+
+    def close(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "CandleRegistry":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
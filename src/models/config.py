@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass(frozen=True)
@@ -11,3 +11,9 @@ class Config:
     atr_stop_loss: float
     enable_trading: bool
     params: dict
+    base_timeframe: str | None = None
+    timeframes: list[str] = field(default_factory=list)
+    candle_close_offset: float | None = None
+    cycle_deadline: float | None = None
+    price_source: str = "tickers"
+    risk: dict | None = None
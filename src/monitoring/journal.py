@@ -0,0 +1,263 @@
+import math
+import time
+import queue
+import struct
+import threading
+import numpy as np
+import pandas as pd
+from enum import IntEnum
+from pathlib import Path
+from loguru import logger
+
+from src.models.trading import Trend
+
+MAGIC = b"CWJ1"
+HEADER = struct.Struct("<4sHH8x")
+RECORD = struct.Struct("<dIB24sbbbBddd")
+RECORD_DTYPE = np.dtype(
+    [
+        ("timestamp", "<f8"),
+        ("cycle", "<u4"),
+        ("kind", "u1"),
+        ("symbol", "S24"),
+        ("side", "i1"),
+        ("position_trend", "i1"),
+        ("market_trend", "i1"),
+        ("action", "u1"),
+        ("price", "<f8"),
+        ("amount", "<f8"),
+        ("value", "<f8"),
+    ]
+)
+VERSION = 1
+
+TREND_CODES = {Trend.UP: 1, Trend.DOWN: -1, Trend.NONE: 0}
+SIDE_CODES = {"buy": 1, "sell": -1}
+
+
+class RecordKind(IntEnum):
+    DECISION = 1
+    ORDER = 2
+    FILL = 3
+    ERROR = 4
+
+
+class Action(IntEnum):
+    NONE = 0
+    NO_TREND = 1
+    IN_LINE = 2
+    OPEN = 3
+    REVERSE = 4
+
+
+class TradeJournal:
+    """Append-only binary journal of trade decisions, orders and fills
+
+    Every record is a fixed-size little-endian struct matching `RECORD_DTYPE`,
+    after a short header with magic, version and record size. Callers only
+    enqueue tuples, a background thread packs and writes them in batches and
+    flushes at least every `flush_interval` seconds.
+    """
+
+    def __init__(self, path: str | Path, flush_interval: float = 1.0) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        # Stamped on every record, set by the bot at the start of a cycle
+        self.cycle = 0
+
+        self._file = self.path.open("ab")
+        if self._file.tell() == 0:
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        else:
+            _check_header(self.path)
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        # Orders the closed check of producers with close, so no record is
+        # enqueued behind the writer's stop sentinel
+        self._lock = threading.Lock()
+        self._closed = False
+        self.dropped = 0
+        self._thread = threading.Thread(
+            target=self._write_loop, name="trade-journal", daemon=True
+        )
+        self._thread.start()
+
+    def decision(
+        self,
+        symbol: str,
+        position_trend: Trend,
+        market_trend: Trend,
+        price: float,
+        action: Action,
+    ) -> None:
+        self._put(
+            RecordKind.DECISION,
+            symbol,
+            0,
+            TREND_CODES[position_trend],
+            TREND_CODES[market_trend],
+            action,
+            price,
+        )
+
+    def order(self, order: dict) -> None:
+        """A submitted order, `value` holds the callback rate of stops"""
+        params = order.get("params") or {}
+        self._put(
+            RecordKind.ORDER,
+            order["symbol"],
+            SIDE_CODES.get(str(order["side"]), 0),
+            price=order.get("price"),
+            amount=order["amount"],
+            value=params.get("callbackRate"),
+        )
+
+    def fill(self, order: dict, result: dict) -> None:
+        """An accepted order, with the fill as far as the response reports it"""
+        self._put(
+            RecordKind.FILL,
+            order["symbol"],
+            SIDE_CODES.get(str(order["side"]), 0),
+            price=result.get("average") or result.get("price"),
+            amount=result.get("filled"),
+        )
+
+    def error(self, order: dict) -> None:
+        self._put(
+            RecordKind.ERROR,
+            order["symbol"],
+            SIDE_CODES.get(str(order["side"]), 0),
+            amount=order["amount"],
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+
+        self._thread.join()
+        self._file.close()
+
+    def _put(
+        self,
+        kind: RecordKind,
+        symbol: str,
+        side: int = 0,
+        position_trend: int = 0,
+        market_trend: int = 0,
+        action: int = Action.NONE,
+        price: float | None = None,
+        amount: float | None = None,
+        value: float | None = None,
+    ) -> None:
+        record = (
+            time.time(),
+            self.cycle,
+            kind,
+            symbol,
+            side,
+            position_trend,
+            market_trend,
+            action,
+            price,
+            amount,
+            value,
+        )
+        with self._lock:
+            # Nothing writes records enqueued after close, say so once
+            if self._closed:
+                if not self.dropped:
+                    logger.warning("Trade journal is closed, dropping records")
+                self.dropped += 1
+                return
+
+            self._queue.put(record)
+
+    def _write_loop(self) -> None:
+        running = True
+        while running:
+            try:
+                records = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+
+            # Drain everything queued meanwhile into a single write
+            while True:
+                try:
+                    records.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if None in records:
+                running = False
+                records = [record for record in records if record is not None]
+
+            # One bad record must not take the rest of the batch with it
+            packed = []
+            for record in records:
+                try:
+                    packed.append(_pack(record))
+                except (struct.error, TypeError, ValueError) as e:
+                    logger.error(f"Trade journal record skipped: {str(e)}")
+
+            try:
+                self._file.write(b"".join(packed))
+                self._file.flush()
+            except OSError as e:
+                logger.error(f"Trade journal write failed: {str(e)}")
+
+
+def _float(value) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _pack(record: tuple) -> bytes:
+    timestamp, cycle, kind, symbol, side, position, market, action, *values = record
+    return RECORD.pack(
+        timestamp,
+        cycle,
+        kind,
+        symbol.encode(),
+        side,
+        position,
+        market,
+        action,
+        *map(_float, values),
+    )
+
+
+def _check_header(path: Path) -> None:
+    with path.open("rb") as f:
+        magic, version, size = HEADER.unpack(f.read(HEADER.size))
+
+    if magic != MAGIC or version != VERSION or size != RECORD.size:
+        raise ValueError(f"{path} is not a version {VERSION} trade journal")
+
+
+def read_journal(path: str | Path) -> np.ndarray:
+    """All complete records of a journal as a structured array"""
+    path = Path(path)
+    _check_header(path)
+    data = path.read_bytes()[HEADER.size :]
+
+    # A crash may leave a partially written last record
+    usable = len(data) - len(data) % RECORD_DTYPE.itemsize
+    return np.frombuffer(data[:usable], dtype=RECORD_DTYPE)
+
+
+def journal_frame(path: str | Path) -> pd.DataFrame:
+    """Journal records as a DataFrame with decoded symbols, kinds and actions"""
+    records = read_journal(path)
+    df = pd.DataFrame({name: records[name] for name in RECORD_DTYPE.names})
+    df["datetime"] = pd.to_datetime(df["timestamp"], unit="s")
+    df["symbol"] = df["symbol"].str.decode("utf-8")
+    df["kind"] = pd.Categorical.from_codes(
+        df["kind"] - 1, [kind.name for kind in RecordKind]
+    )
+    df["action"] = pd.Categorical.from_codes(
+        df["action"], [action.name for action in Action]
+    )
+    return df
@@ -0,0 +1,323 @@
+import asyncio
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from contextlib import contextmanager
+from loguru import logger
+
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+def _format_labels(labelnames: tuple[str, ...], values: tuple, **extra) -> str:
+    pairs = list(zip(labelnames, values)) + list(extra.items())
+    if not pairs:
+        return ""
+
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[tuple, list[int]] = defaultdict(
+            lambda: [0] * (len(self.buckets) + 1)
+        )
+        self._sums: dict[tuple, float] = defaultdict(float)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        self._counts[key][bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        return sum(self._counts.get(self._key(labels), []))
+
+    def sum(self, **labels) -> float:
+        return self._sums.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _format_labels(self.labelnames, key, le=le)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {self._sums[key]}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+
+        return lines
+
+
+class Gauge:
+    def __init__(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        self._values[key] = value
+
+    def get(self, **labels) -> float | None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        return self._values.get(key)
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+        ]
+        for key, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+
+        return lines
+
+
+class Counter:
+    def __init__(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = defaultdict(float)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        self._values[key] += amount
+
+    def get(self, **labels) -> float:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        return self._values.get(key, 0.0)
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        for key, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.metrics: dict[str, Histogram | Gauge | Counter] = {}
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        histogram = Histogram(name, documentation, labelnames, buckets)
+        self.metrics[name] = histogram
+        return histogram
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> Gauge:
+        gauge = Gauge(name, documentation, labelnames)
+        self.metrics[name] = gauge
+        return gauge
+
+    def counter(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> Counter:
+        counter = Counter(name, documentation, labelnames)
+        self.metrics[name] = counter
+        return counter
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "cryptowarren_stage_seconds",
+    "Duration of a trade cycle stage per symbol",
+    ("stage", "symbol"),
+)
+CYCLE_SECONDS = REGISTRY.histogram(
+    "cryptowarren_cycle_seconds", "Duration of a full trade cycle"
+)
+CANDLE_ORDER_SKEW_SECONDS = REGISTRY.histogram(
+    "cryptowarren_candle_order_skew_seconds",
+    "Time between the latest candle close and the first order of a cycle",
+)
+LAST_CANDLE_ORDER_SKEW_SECONDS = REGISTRY.gauge(
+    "cryptowarren_last_candle_order_skew_seconds",
+    "Candle close to first order skew of the latest cycle with orders",
+)
+
+SCHEDULE_LATENESS_SECONDS = REGISTRY.histogram(
+    "cryptowarren_schedule_lateness_seconds",
+    "Delay between the scheduled and the actual start of a trade cycle",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 60.0),
+)
+MISSED_RUNS = REGISTRY.counter(
+    "cryptowarren_schedule_missed_runs_total",
+    "Scheduled trade cycles coalesced into a later run",
+)
+DEFERRED_SYMBOLS = REGISTRY.counter(
+    "cryptowarren_deferred_symbols_total",
+    "Symbols deferred to the next cycle after the cycle deadline passed",
+    ("symbol",),
+)
+
+PORTFOLIO_VOLATILITY = REGISTRY.gauge(
+    "cryptowarren_portfolio_volatility",
+    "Expected portfolio volatility per candle in quote currency after sizing",
+)
+
+EM_ITERATIONS = REGISTRY.histogram(
+    "cryptowarren_kalman_em_iterations",
+    "EM iterations run per symbol and strategy step",
+    ("symbol",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50),
+)
+EM_LOGLIKELIHOOD = REGISTRY.gauge(
+    "cryptowarren_kalman_loglikelihood_per_bar",
+    "Log-likelihood per bar of the latest fitted Kalman filter",
+    ("symbol",),
+)
+
+
+@contextmanager
+def span(stage: str, symbol: str = "*"):
+    """Time a trade cycle stage and record it in the stage histogram"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        STAGE_SECONDS.observe(duration, stage=stage, symbol=symbol)
+        logger.bind(stage=stage, symbol=symbol, duration=duration).trace(
+            f"Span {stage} for {symbol} took {duration * 1000:.1f}ms"
+        )
+
+
+Handler = Callable[[dict[str, str]], Awaitable[tuple[int, str]]]
+
+
+class MetricsServer:
+    def __init__(
+        self,
+        registry: MetricsRegistry = REGISTRY,
+        host: str = "0.0.0.0",
+        port: int = 8000,
+    ) -> None:
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.routes: dict[tuple[str, str], Handler] = {
+            ("GET", "/metrics"): self._metrics
+        }
+        self.server: asyncio.Server | None = None
+
+    def route(self, method: str, path: str, handler: Handler) -> None:
+        self.routes[(method.upper(), path)] = handler
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        logger.info(f"Metrics endpoint listening on {self.host}:{self.port}")
+
+    async def stop(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def _metrics(self, query: dict[str, str]) -> tuple[int, str]:
+        return 200, self.registry.render()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+
+            method, target, _ = request_line.decode().split(" ", 2)
+            path, _, query_string = target.partition("?")
+            query = dict(
+                pair.split("=", 1) if "=" in pair else (pair, "")
+                for pair in query_string.split("&")
+                if pair
+            )
+
+            if handler := self.routes.get((method.upper(), path)):
+                status, body = await handler(query)
+            else:
+                status, body = 404, "Not found\n"
+        except Exception as e:
+            logger.error(f"Metrics request failed: {str(e)}")
+            status, body = 500, "Internal error\n"
+
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found"}.get(status, "Error")
+        payload = body.encode()
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\n"
+            "Content-Type: text/plain; version=0.0.4\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Connection: close\r\n\r\n".encode()
+            + payload
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
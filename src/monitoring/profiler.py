@@ -0,0 +1,102 @@
+import sys
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from loguru import logger
+
+
+class StackSampler:
+    """Sample the call stack of one thread from a background thread"""
+
+    def __init__(self, thread_id: int, interval: float = 0.005) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format read by flamegraph.pl and speedscope"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+
+class CycleProfiler:
+    """Profile the next N trade cycles with cProfile and a stack sampler
+
+    Each profiled cycle writes a .pstats file and a .collapsed file whose
+    names carry the time in milliseconds, a sequence number, the strategy
+    and the symbol count, so cycles profiled within a second do not collide.
+    """
+
+    def __init__(self, output_dir: str | Path = "profiles", interval: float = 0.005):
+        self.output_dir = Path(output_dir)
+        self.interval = interval
+        self.remaining = 0
+        self.written = 0
+
+    @property
+    def armed(self) -> bool:
+        return self.remaining > 0
+
+    def arm(self, cycles: int = 1) -> None:
+        self.remaining = max(cycles, 0)
+        logger.info(f"Profiling armed for the next {self.remaining} trade cycle(s)")
+
+    async def run(self, cycle: Callable[[], Awaitable], strategy: str, symbols: int):
+        if not self.armed:
+            return await cycle()
+
+        self.remaining -= 1
+        profile = cProfile.Profile()
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        sampler.start()
+        profile.enable()
+        try:
+            return await cycle()
+        finally:
+            profile.disable()
+            sampler.stop()
+            self._write(profile, sampler, strategy, symbols)
+
+    def _write(
+        self,
+        profile: cProfile.Profile,
+        sampler: StackSampler,
+        strategy: str,
+        symbols: int,
+    ) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        now = time.time()
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(now))
+        stamp = f"{stamp}.{int(now % 1 * 1000):03d}"
+        self.written += 1
+        stem = self.output_dir / f"{stamp}-{self.written}-{strategy}-{symbols}symbols"
+
+        pstats.Stats(profile).dump_stats(f"{stem}.pstats")
+        Path(f"{stem}.collapsed").write_text(sampler.collapsed())
+        logger.info(f"Profile written to {stem}.pstats and {stem}.collapsed")
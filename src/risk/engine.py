@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+from collections.abc import Mapping
+
+from src.models.exchange import Market
+
+
+def _bound(value: float | None, default: float) -> float:
+    return default if value is None else float(value)
+
+
+class RiskEngine:
+    """Portfolio-aware position sizing for all symbols in one vectorized pass
+
+    Log returns of closed candles update an exponentially weighted covariance
+    matrix in place, O(symbols²) per new candle, so it is never recomputed
+    from the full history. Target sizes start from the notional a position
+    may take at the leverage the market allows, are scaled down to a per
+    position volatility, and finally scaled together so gross notional and
+    portfolio volatility including held positions stay within their limits.
+    Notionals are in quote currency, volatilities per candle.
+    """
+
+    def __init__(
+        self,
+        symbols: list[str],
+        position_notional_value: float,
+        leverage: float,
+        halflife: float = 48.0,
+        min_periods: int = 24,
+        target_volatility: float | None = None,
+        max_volatility: float | None = None,
+        max_gross_notional: float | None = None,
+    ) -> None:
+        self.symbols = list(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.position_notional_value = position_notional_value
+        self.leverage = leverage
+        self.decay = 0.5 ** (1 / halflife)
+        self.min_periods = min_periods
+        self.target_volatility = target_volatility
+        self.max_volatility = max_volatility
+        self.max_gross_notional = max_gross_notional
+
+        n = len(self.symbols)
+        self._covariance = np.zeros((n, n))
+        self.observations = np.zeros(n, dtype=np.int64)
+        self.last_close = np.full(n, np.nan)
+        self.last_timestamp: int | None = None
+
+        # Market limits, unbounded until markets are loaded
+        self.max_notional = np.full(n, float(position_notional_value))
+        self.min_cost = np.zeros(n)
+        self.min_amount = np.zeros(n)
+        self.max_amount = np.full(n, np.inf)
+
+    def set_markets(self, markets: Mapping[str, Market]) -> None:
+        """Per symbol caps from the leverage, cost and amount limits"""
+        margin = self.position_notional_value / self.leverage
+        for symbol, market in markets.items():
+            if (i := self.index.get(symbol)) is None:
+                continue
+
+            limit = market.limit
+            max_leverage = _bound(limit.leverage.max, self.leverage)
+            self.max_notional[i] = min(
+                margin * min(self.leverage, max_leverage),
+                _bound(limit.cost.max, np.inf),
+            )
+            self.min_cost[i] = _bound(limit.cost.min, 0.0)
+            self.min_amount[i] = _bound(limit.amount.min, 0.0)
+            self.max_amount[i] = min(
+                _bound(limit.amount.max, np.inf), _bound(limit.market.max, np.inf)
+            )
+
+    def update(self, closes: Mapping[str, pd.Series]) -> None:
+        """Fold closes newer than the last update into the covariance
+
+        Series are indexed by candle timestamp, the last candle of each is
+        taken to be still forming and left for a later update.
+        """
+        columns, stamps, values = [], [], []
+        for symbol, series in closes.items():
+            if (i := self.index.get(symbol)) is None:
+                continue
+
+            index = series.index.to_numpy()
+            start = 0
+            if self.last_timestamp is not None:
+                start = np.searchsorted(index, self.last_timestamp, side="right")
+            columns.append(i)
+            stamps.append(index[start:-1])
+            values.append(series.to_numpy()[start:-1])
+
+        if not columns or not (timestamps := np.unique(np.concatenate(stamps))).size:
+            return
+
+        prices = np.full((len(timestamps) + 1, len(self.symbols)), np.nan)
+        prices[0] = self.last_close
+        for i, stamp, value in zip(columns, stamps, values):
+            prices[np.searchsorted(timestamps, stamp) + 1, i] = value
+
+        # Carry the last close forward over candles a symbol is missing
+        observed = ~np.isnan(prices)
+        rows = np.where(observed, np.arange(len(prices))[:, None], 0)
+        prices = prices[np.maximum.accumulate(rows, axis=0), np.arange(prices.shape[1])]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            returns = np.log(prices[1:] / prices[:-1])
+        valid = np.isfinite(returns)
+        returns[~valid] = 0.0
+
+        k = len(returns)
+        weights = (1 - self.decay) * self.decay ** np.arange(k - 1, -1, -1)
+        self._covariance *= self.decay**k
+        self._covariance += (returns * weights[:, None]).T @ returns
+
+        self.observations += valid.sum(axis=0)
+        self.last_close = prices[-1]
+        self.last_timestamp = int(timestamps[-1])
+
+    @property
+    def ready(self) -> np.ndarray:
+        return self.observations >= self.min_periods
+
+    @property
+    def volatility(self) -> np.ndarray:
+        """Bias corrected volatility of log returns per candle"""
+        weight = 1 - self.decay ** np.maximum(self.observations, 1)
+        return np.sqrt(np.diag(self._covariance) / weight)
+
+    @property
+    def covariance(self) -> np.ndarray:
+        """EWMA correlations scaled by the bias corrected volatilities"""
+        raw = np.sqrt(np.diag(self._covariance))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            correlation = self._covariance / np.outer(raw, raw)
+        correlation = np.nan_to_num(correlation)
+        volatility = self.volatility
+        return correlation * np.outer(volatility, volatility)
+
+    def portfolio_volatility(
+        self, notionals: np.ndarray, covariance: np.ndarray | None = None
+    ) -> float:
+        covariance = self.covariance if covariance is None else covariance
+        return float(np.sqrt(max(notionals @ covariance @ notionals, 0.0)))
+
+    def target_notionals(
+        self, signals: np.ndarray, prices: np.ndarray, held: np.ndarray
+    ) -> np.ndarray:
+        """Signed notionals for new entries, given held position notionals
+
+        `signals` are +1, -1 or 0 per symbol, symbols without enough history
+        or without a price get no entry. Held positions count towards the
+        portfolio limits but are not resized.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        held = np.nan_to_num(np.asarray(held, dtype=np.float64))
+        with np.errstate(invalid="ignore"):
+            caps = np.fmin(self.max_notional, self.max_amount * prices)
+
+        volatility = self.volatility
+        if self.target_volatility is not None:
+            with np.errstate(divide="ignore"):
+                caps *= np.minimum(1.0, self.target_volatility / volatility)
+
+        tradable = self.ready & (prices > 0)
+        entries = np.where(tradable, np.sign(signals) * caps, 0.0)
+        entries = np.nan_to_num(entries)
+
+        scale = 1.0
+        gross = np.abs(entries).sum()
+        if self.max_gross_notional is not None and gross > 0:
+            room = self.max_gross_notional - np.abs(held).sum()
+            scale = min(scale, max(room, 0.0) / gross)
+
+        if self.max_volatility is not None and entries.any():
+            # Largest x with (held + x·entries)ᵀ Σ (held + x·entries) ≤ limit²
+            covariance = self.covariance
+            exposure = covariance @ entries
+            a = entries @ exposure
+            b = held @ exposure
+            c = held @ covariance @ held - self.max_volatility**2
+            if a > 0:
+                root = (-b + np.sqrt(max(b * b - a * c, 0.0))) / a
+                scale = min(scale, max(root, 0.0))
+
+        entries *= scale
+
+        # Entries below the exchange minimums cannot be placed
+        with np.errstate(invalid="ignore", divide="ignore"):
+            amounts = np.abs(entries) / prices
+        too_small = (np.abs(entries) < self.min_cost) | (amounts < self.min_amount)
+        entries[too_small] = 0.0
+        return entries
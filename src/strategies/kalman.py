@@ -0,0 +1,247 @@
+import time
+import numpy as np
+from dataclasses import dataclass
+
+
+@dataclass
+class KalmanParams:
+    """Parameters of a batch of one-dimensional random walk Kalman filters
+
+    Mirrors the defaults of pykalman's KalmanFilter for a price series: unit
+    transition and observation matrices, no offsets, and the covariances
+    and initial state estimated by EM. Every field holds one value per series.
+    """
+
+    transition_covariance: np.ndarray
+    observation_covariance: np.ndarray
+    initial_state_mean: np.ndarray
+    initial_state_covariance: np.ndarray
+
+    @classmethod
+    def default(cls, n_series: int) -> "KalmanParams":
+        return cls(
+            transition_covariance=np.ones(n_series),
+            observation_covariance=np.ones(n_series),
+            initial_state_mean=np.zeros(n_series),
+            initial_state_covariance=np.ones(n_series),
+        )
+
+    @classmethod
+    def stack(cls, params: list["KalmanParams"]) -> "KalmanParams":
+        return cls(
+            *(
+                np.concatenate([getattr(p, name) for p in params])
+                for name in cls.__dataclass_fields__
+            )
+        )
+
+    def __getitem__(self, index) -> "KalmanParams":
+        return KalmanParams(
+            *(
+                np.atleast_1d(getattr(self, name)[index])
+                for name in self.__dataclass_fields__
+            )
+        )
+
+
+@dataclass
+class FilterResult:
+    predicted_means: np.ndarray
+    predicted_covariances: np.ndarray
+    filtered_means: np.ndarray
+    filtered_covariances: np.ndarray
+    loglikelihood: np.ndarray
+
+
+@dataclass
+class EMResult:
+    """Fitted parameters with the EM iterations run for every series
+
+    `loglikelihood` is the one of the parameters seen by the last E-step.
+    """
+
+    params: KalmanParams
+    iterations: np.ndarray
+    loglikelihood: np.ndarray
+    converged: np.ndarray
+
+
+@dataclass
+class SmootherResult:
+    means: np.ndarray
+    covariances: np.ndarray
+    gains: np.ndarray
+
+
+class BatchedKalmanFilter:
+    """Kalman filter, smoother and EM over many series in lockstep
+
+    Observations have shape (n_timesteps, n_series). Each time step advances
+    every series with a single vectorized update, so the cost per bar is
+    nearly independent of the number of series.
+
+    EM runs at most `n_iter` iterations. With a `tolerance`, a series stops
+    once its log-likelihood per observation improves by less than that and
+    leaves the batch. `time_budget` is a wall-clock limit in seconds for the
+    whole fit, which every series shares as they advance in lockstep, so the
+    tail latency stays the same whatever the number of series. EM stops before
+    an iteration that would likely overrun it, always running at least one.
+    """
+
+    def __init__(
+        self,
+        n_iter: int = 10,
+        tolerance: float | None = None,
+        time_budget: float | None = None,
+    ) -> None:
+        self.n_iter = n_iter
+        self.tolerance = tolerance
+        self.time_budget = time_budget
+
+    def filter(self, observations: np.ndarray, params: KalmanParams) -> FilterResult:
+        z = observations
+        q = params.transition_covariance
+        r = params.observation_covariance
+
+        predicted_means = np.empty_like(z)
+        predicted_covariances = np.empty_like(z)
+        filtered_means = np.empty_like(z)
+        filtered_covariances = np.empty_like(z)
+        loglikelihood = np.zeros(z.shape[1])
+
+        mean = params.initial_state_mean
+        covariance = params.initial_state_covariance
+        for t in range(z.shape[0]):
+            if t > 0:
+                covariance = covariance + q
+
+            innovation_covariance = covariance + r
+            innovation = z[t] - mean
+            gain = covariance / innovation_covariance
+            loglikelihood -= 0.5 * (
+                np.log(2 * np.pi * innovation_covariance)
+                + innovation**2 / innovation_covariance
+            )
+
+            predicted_means[t] = mean
+            predicted_covariances[t] = covariance
+            mean = mean + gain * innovation
+            covariance = covariance - gain * covariance
+            filtered_means[t] = mean
+            filtered_covariances[t] = covariance
+
+        return FilterResult(
+            predicted_means,
+            predicted_covariances,
+            filtered_means,
+            filtered_covariances,
+            loglikelihood,
+        )
+
+    def _smooth(self, filtered: FilterResult) -> SmootherResult:
+        means = np.empty_like(filtered.filtered_means)
+        covariances = np.empty_like(filtered.filtered_covariances)
+        gains = np.empty_like(filtered.filtered_means[:-1])
+
+        means[-1] = filtered.filtered_means[-1]
+        covariances[-1] = filtered.filtered_covariances[-1]
+        for t in range(len(means) - 2, -1, -1):
+            gain = (
+                filtered.filtered_covariances[t] / filtered.predicted_covariances[t + 1]
+            )
+            means[t] = filtered.filtered_means[t] + gain * (
+                means[t + 1] - filtered.predicted_means[t + 1]
+            )
+            covariances[t] = filtered.filtered_covariances[t] + gain**2 * (
+                covariances[t + 1] - filtered.predicted_covariances[t + 1]
+            )
+            gains[t] = gain
+
+        return SmootherResult(means, covariances, gains)
+
+    def smooth(self, observations: np.ndarray, params: KalmanParams) -> np.ndarray:
+        """Smoothed state means with shape (n_timesteps, n_series)"""
+        return self.smooth_loglikelihood(observations, params)[0]
+
+    def smooth_loglikelihood(
+        self, observations: np.ndarray, params: KalmanParams
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Smoothed state means and the log-likelihood of every series"""
+        filtered = self.filter(observations, params)
+        return self._smooth(filtered).means, filtered.loglikelihood
+
+    def em(self, observations: np.ndarray, params: KalmanParams) -> KalmanParams:
+        """Fit the parameters by EM, starting from the given parameters"""
+        return self.fit(observations, params).params
+
+    def fit(self, observations: np.ndarray, params: KalmanParams) -> EMResult:
+        z = observations
+        n_timesteps, n_series = z.shape
+        params = KalmanParams(
+            *(getattr(params, name).copy() for name in params.__dataclass_fields__)
+        )
+        iterations = np.zeros(n_series, dtype=int)
+        loglikelihood = np.full(n_series, -np.inf)
+        converged = np.zeros(n_series, dtype=bool)
+
+        active = np.arange(n_series)
+        start = time.perf_counter()
+        for _ in range(self.n_iter):
+            iteration_start = time.perf_counter()
+            filtered = self.filter(z[:, active], params[active])
+
+            # Series which stopped improving keep their current parameters
+            if self.tolerance is not None:
+                gain = (filtered.loglikelihood - loglikelihood[active]) / n_timesteps
+                done = gain < self.tolerance
+            else:
+                done = np.zeros(len(active), dtype=bool)
+
+            loglikelihood[active] = filtered.loglikelihood
+            converged[active[done]] = True
+            update = ~done
+            if update.any():
+                updated = self._m_step(z[:, active], self._smooth(filtered))
+                for name in params.__dataclass_fields__:
+                    getattr(params, name)[active[update]] = getattr(updated, name)[
+                        update
+                    ]
+                iterations[active[update]] += 1
+
+            active = active[update]
+            if not len(active):
+                break
+
+            now = time.perf_counter()
+            if (
+                self.time_budget is not None
+                and now - start + (now - iteration_start) > self.time_budget
+            ):
+                break
+
+        return EMResult(params, iterations, loglikelihood, converged)
+
+    def _m_step(self, z: np.ndarray, smoothed: SmootherResult) -> KalmanParams:
+        n_timesteps = z.shape[0]
+        means, covariances = smoothed.means, smoothed.covariances
+        pairwise_covariances = covariances[1:] * smoothed.gains
+
+        observation_covariance = np.mean((z - means) ** 2 + covariances, axis=0)
+        transition_covariance = (
+            np.sum(
+                np.diff(means, axis=0) ** 2
+                + covariances[:-1]
+                + covariances[1:]
+                - 2 * pairwise_covariances,
+                axis=0,
+            )
+            / (n_timesteps - 1)
+            if n_timesteps > 1
+            else np.zeros(z.shape[1])
+        )
+        return KalmanParams(
+            transition_covariance=transition_covariance,
+            observation_covariance=observation_covariance,
+            initial_state_mean=means[0].copy(),
+            initial_state_covariance=covariances[0].copy(),
+        )
@@ -1,11 +1,16 @@
+from collections import defaultdict
 from ta.trend import EMAIndicator
 from pykalman import KalmanFilter
 from scipy.signal import savgol_filter
 from loguru import logger
+import numpy as np
 import pandas as pd
 
 from src.strategies.strategy import Strategy
+from src.strategies.kalman import BatchedKalmanFilter, KalmanParams
+from src.strategies.savgol import StreamingSavgolFilter
 from src.models.trading import Trend
+from src.monitoring.metrics import EM_ITERATIONS, EM_LOGLIKELIHOOD
 
 
 class EMATrendStrategy(Strategy):
@@ -55,6 +60,7 @@ class SavgolTrendStrategy(Strategy):
         self.window = config.params["ema_window"]
         self.smooth_window = config.params["smooth_window"]
         self.polyorder = config.params["polyorder"]
+        self.filters: dict[str, StreamingSavgolFilter] = {}
 
     def buy_signal(self, ohlcv):
         trend = self.current_trend(ohlcv)
@@ -88,11 +94,44 @@ class SavgolTrendStrategy(Strategy):
 
         return trend
 
+    def current_trends(self, prices: dict[str, pd.Series]) -> dict[str, Trend]:
+        # Streaming needs candle timestamps as index to tell new candles apart
+        trends = {}
+        for symbol, series in prices.items():
+            index = series.index
+            if isinstance(index, pd.RangeIndex) and index.start == 0:
+                trends[symbol] = self.current_trend(series)
+                continue
+
+            if len(series) < self.window:
+                trends[symbol] = Trend.NONE
+                continue
+
+            if symbol not in self.filters:
+                self.filters[symbol] = StreamingSavgolFilter(
+                    self.window, self.smooth_window, self.polyorder
+                )
+            delta = self.filters[symbol].update(series)
+            logger.debug(f"Savgol {symbol}: {delta}")
+
+            if not delta:
+                trends[symbol] = Trend.NONE
+            else:
+                trends[symbol] = Trend.UP if delta > 0 else Trend.DOWN
+
+        return trends
+
 
 class KalmanTrendStrategy(Strategy):
     def __init__(self, config):
         super().__init__(config)
         self.kf = KalmanFilter()
+        self.batched_kf = BatchedKalmanFilter(
+            n_iter=config.params.get("em_max_iter", 10),
+            tolerance=config.params.get("em_tolerance"),
+            time_budget=config.params.get("em_time_budget"),
+        )
+        self.symbol_params: dict[str, KalmanParams] = {}
 
     def buy_signal(self, ohlcv):
         trend = self.current_trend(ohlcv)
@@ -113,6 +152,46 @@ class KalmanTrendStrategy(Strategy):
 
         logger.debug(f"Kalman: {', '.join([str(round(v, 3)) for v in diff.tail()])}")
 
+        return self._trend(delta)
+
+    def current_trends(self, prices: dict[str, pd.Series]) -> dict[str, Trend]:
+        # Series of equal length are filtered together, each symbol keeps
+        # its own EM parameters between calls
+        by_length = defaultdict(list)
+        for symbol, series in prices.items():
+            by_length[len(series)].append(symbol)
+
+        trends = {}
+        for length, symbols in by_length.items():
+            if length < 2:
+                trends.update({symbol: Trend.NONE for symbol in symbols})
+                continue
+
+            observations = np.column_stack(
+                [prices[symbol].to_numpy(dtype=float) for symbol in symbols]
+            )
+            params = KalmanParams.stack(
+                [
+                    self.symbol_params.get(symbol, KalmanParams.default(1))
+                    for symbol in symbols
+                ]
+            )
+            fit = self.batched_kf.fit(observations, params)
+            smoothed, loglikelihood = self.batched_kf.smooth_loglikelihood(
+                observations, fit.params
+            )
+            deltas = smoothed[-1] - smoothed[-2]
+
+            for i, symbol in enumerate(symbols):
+                self.symbol_params[symbol] = fit.params[i]
+                EM_ITERATIONS.observe(fit.iterations[i], symbol=symbol)
+                EM_LOGLIKELIHOOD.set(loglikelihood[i] / length, symbol=symbol)
+                trends[symbol] = self._trend(float(deltas[i]))
+                logger.debug(f"Kalman {symbol}: {deltas[i]:.3f}")
+
+        return trends
+
+    def _trend(self, delta: float) -> Trend:
         # A too small delta, is not considered as a trend
         if -0.1 <= delta <= 0.1:
             trend = Trend.NONE
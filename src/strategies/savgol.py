@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+from collections import deque
+from scipy.signal import savgol_coeffs
+
+
+class StreamingSavgolFilter:
+    """Latest gradient of a Savitzky–Golay smoothed EMA, updated per candle
+
+    Reproduces the last difference of `savgol_filter(ema, smooth_window,
+    polyorder)` in its default 'interp' mode, where the last points come from
+    a polynomial fitted to the final window. That difference is a fixed dot
+    product with the last `smooth_window` EMA values, so each new candle
+    costs O(smooth_window) instead of O(history).
+
+    Prices must be indexed by increasing candle timestamps. Every candle but
+    the last one is committed to the filter state, the last candle may still
+    be forming and is only evaluated.
+    """
+
+    def __init__(self, ema_window: int, smooth_window: int, polyorder: int) -> None:
+        self.alpha = 2 / (ema_window + 1)
+        self.smooth_window = smooth_window
+        self.coeffs = savgol_coeffs(
+            smooth_window, polyorder, pos=smooth_window - 1, use="dot"
+        ) - savgol_coeffs(smooth_window, polyorder, pos=smooth_window - 2, use="dot")
+
+        self.ema: float | None = None
+        self.emas: deque[float] = deque(maxlen=smooth_window - 1)
+        self.last_timestamp = None
+
+    def reset(self, prices: pd.Series) -> None:
+        """Rebuild the state from the full history"""
+        committed = prices.iloc[:-1]
+        emas = committed.ewm(alpha=self.alpha, adjust=False).mean()
+        self.emas.clear()
+        self.emas.extend(emas.iloc[-(self.smooth_window - 1) :].tolist())
+        self.ema = float(emas.iloc[-1]) if len(emas) else None
+        self.last_timestamp = committed.index[-1] if len(committed) else None
+
+    def update(self, prices: pd.Series) -> float | None:
+        """Gradient at the last candle, None while the history is too short"""
+        timestamps = prices.index.to_numpy()
+        start = (
+            np.searchsorted(timestamps, self.last_timestamp)
+            if self.last_timestamp is not None
+            else len(timestamps)
+        )
+        if start >= len(timestamps) - 1 or timestamps[start] != self.last_timestamp:
+            self.reset(prices)
+        else:
+            for price in prices.iloc[start + 1 : -1].tolist():
+                self.ema = self.alpha * price + (1 - self.alpha) * self.ema
+                self.emas.append(self.ema)
+            self.last_timestamp = timestamps[-2]
+
+        if len(self.emas) < self.smooth_window - 1:
+            return None
+
+        price = float(prices.iloc[-1])
+        ema = self.alpha * price + (1 - self.alpha) * self.ema
+        return float(np.dot(self.coeffs[:-1], self.emas) + self.coeffs[-1] * ema)
@@ -3,15 +3,24 @@ import pandas as pd
 
 from src.models.trading import Trend
 from src.models.config import Config
+from src.market_data.resampler import CandleResampler
 
 
 class Strategy(ABC):
+    # Bump when results change without a change to the strategy class itself
+    version: int = 1
+
     def __init__(self, config: Config):
         self.config = config
+        self.resamplers: dict[str, CandleResampler] = {}
 
     def get_config(self) -> Config:
         return self.config
 
+    def ohlcv(self, symbol: str, timeframe: str) -> pd.DataFrame:
+        """Candles of a symbol at any timeframe derived from its base stream"""
+        return self.resamplers[symbol].frame(timeframe)
+
     @abstractmethod
     def buy_signal(self, ohlcv: pd.DataFrame) -> bool:
         """Check if sell signal occurs based on the OHLCV data"""
@@ -23,3 +32,7 @@ class Strategy(ABC):
     @abstractmethod
     def current_trend(self, values: pd.Series) -> Trend:
         """Determine the current trend based on the OHLCV data"""
+
+    def current_trends(self, values: dict[str, pd.Series]) -> dict[str, Trend]:
+        """Determine the current trend of several symbols at once"""
+        return {symbol: self.current_trend(series) for symbol, series in values.items()}
@@ -0,0 +1,78 @@
+import os
+import dataclasses
+
+from src.backtesting.cache import BacktestCache, source_modules
+from src.bots.trading_bot import TradingBot
+from src.strategies.momentum_strategies import (
+    EMATrendStrategy,
+    KalmanTrendStrategy,
+    SavgolTrendStrategy,
+)
+from tests.helpers import config, synthetic_ohlcv
+
+SYMBOLS = ["SOL/USDC:USDC"]
+
+
+def test_key_changes_with_data_strategy_and_config():
+    cache = BacktestCache("unused")
+    ohlcv = synthetic_ohlcv(200)
+    cfg = config(SYMBOLS)
+    key = cache.key(ohlcv, EMATrendStrategy, cfg)
+
+    assert key == cache.key(ohlcv.copy(), EMATrendStrategy, config(SYMBOLS))
+    changed = ohlcv.copy()
+    changed.loc[100, "close"] += 1e-9
+    assert key != cache.key(changed, EMATrendStrategy, cfg)
+    assert key != cache.key(ohlcv.iloc[1:], EMATrendStrategy, cfg)
+    assert key != cache.key(ohlcv, SavgolTrendStrategy, cfg)
+    assert key != cache.key(
+        ohlcv, EMATrendStrategy, dataclasses.replace(cfg, leverage=3)
+    )
+    assert key != cache.key(ohlcv, EMATrendStrategy, cfg, kind="trends")
+
+
+def test_code_digest_covers_imported_modules():
+    assert "src.strategies.kalman" in source_modules(KalmanTrendStrategy)
+    modules = source_modules(TradingBot)
+    assert {"src.executions.orders", "src.risk.engine"} <= set(modules)
+    assert not any(name.startswith(("pandas", "ccxt")) for name in modules)
+
+
+def test_cached_computes_once(tmp_path):
+    cache = BacktestCache(tmp_path)
+    key = cache.key(synthetic_ohlcv(50), EMATrendStrategy, config(SYMBOLS))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"trades": [1, 2, 3]}
+
+    assert cache.cached(key, compute) == {"trades": [1, 2, 3]}
+    assert cache.cached(key, compute) == {"trades": [1, 2, 3]}
+    assert len(calls) == 1
+
+
+def test_lru_eviction_and_invalidation(tmp_path):
+    cache = BacktestCache(tmp_path, max_bytes=10_000)
+    cfg = config(SYMBOLS)
+    keys = [
+        cache.key(synthetic_ohlcv(50), strategy, cfg, run=i)
+        for i, strategy in enumerate(
+            [EMATrendStrategy, EMATrendStrategy, SavgolTrendStrategy]
+        )
+    ]
+    for i, key in enumerate(keys[:2]):
+        cache.put(key, bytes(4_000))
+        os.utime(cache.path(key), (i, i))
+
+    # Reading the oldest entry makes the other one least recently used
+    assert cache.get(keys[0]) is not None
+    cache.put(keys[2], bytes(4_000))
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.size() <= 10_000
+
+    assert cache.invalidate(strategy=SavgolTrendStrategy) == 1
+    assert cache.get(keys[2]) is None
+    assert cache.invalidate() == 1
@@ -0,0 +1,47 @@
+import numpy as np
+
+from src.backtesting.robustness import (
+    block_bootstrap,
+    bootstrap_metrics,
+    path_metrics,
+    simulate,
+)
+
+RETURNS = np.random.default_rng(0).normal(0.001, 0.02, 43)
+
+
+def test_block_level_bootstrap_matches_paths():
+    for block_size in (1, 5, 50):
+        expected = path_metrics(
+            block_bootstrap(RETURNS, 300, block_size, np.random.default_rng(1))
+        )
+        actual = bootstrap_metrics(RETURNS, 300, block_size, np.random.default_rng(1))
+        np.testing.assert_allclose(actual, expected)
+
+
+def test_path_metrics():
+    total, drawdown = path_metrics(
+        np.array([[0.1, -0.3, 0.1, 0.2], [-0.1, 0.0, 0.3, 0]])
+    )
+    np.testing.assert_allclose(total, [0.1, 0.2])
+    np.testing.assert_allclose(drawdown, [0.3, 0.1])
+
+
+def test_simulate_distributions():
+    report = simulate(RETURNS, 2_000, workers=1, seed=7)
+
+    np.testing.assert_allclose(
+        report.returns["shuffle"].values, RETURNS.sum(), rtol=1e-5
+    )
+    assert (report.returns["slippage"].values < RETURNS.sum()).all()
+    assert all(len(d.values) == 2_000 for d in report.drawdowns.values())
+    assert report.summary().shape == (6, 7)
+
+
+def test_simulate_independent_of_workers(monkeypatch):
+    monkeypatch.setattr("src.backtesting.robustness.CHUNK_ELEMENTS", 43 * 100)
+    serial = simulate(RETURNS, 500, methods=["bootstrap"], workers=1, seed=3)
+    parallel = simulate(RETURNS, 500, methods=["bootstrap"], workers=2, seed=3)
+    np.testing.assert_array_equal(
+        serial.drawdowns["bootstrap"].values, parallel.drawdowns["bootstrap"].values
+    )
@@ -0,0 +1,356 @@
+import json
+import time
+import asyncio
+import platform
+import numpy as np
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.bots.trading_bot import TradingBot
+from src.risk.engine import RiskEngine
+from src.strategies.momentum_strategies import (
+    EMATrendStrategy,
+    SavgolTrendStrategy,
+    KalmanTrendStrategy,
+)
+from tests.helpers import config, history, mock_exchange, synthetic_ohlcv
+from tests.mock_exchange import MockExchange
+
+BENCHMARK_DIR = Path(__file__).parent
+BASELINE_FILE = BENCHMARK_DIR / "baselines.json"
+
+BAR_COUNTS = (200, 1500, 100_000)
+SYMBOL_COUNTS = (1, 10, 50)
+RISK_SYMBOL_COUNTS = (50, 300)
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    prepare: Callable[[], Callable]
+    slow: bool = False
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    median: float
+    best: float
+    runs: int
+
+
+@dataclass
+class Comparison:
+    name: str
+    current: float
+    baseline: float | None
+    regression: bool = False
+
+    @property
+    def ratio(self) -> float | None:
+        return self.current / self.baseline if self.baseline else None
+
+
+@dataclass
+class Report:
+    comparisons: list[Comparison] = field(default_factory=list)
+
+    @property
+    def regressions(self) -> list[Comparison]:
+        return [c for c in self.comparisons if c.regression]
+
+    def format(self) -> str:
+        width = max([len(c.name) for c in self.comparisons] + [4])
+        lines = [f"{'case':<{width}}  {'baseline':>10}  {'current':>10}  {'ratio':>7}"]
+        for c in self.comparisons:
+            baseline = f"{c.baseline * 1000:.2f}ms" if c.baseline else "-"
+            ratio = f"{c.ratio:.2f}x" if c.ratio else "new"
+            status = "  REGRESSION" if c.regression else ""
+            lines.append(
+                f"{c.name:<{width}}  {baseline:>10}  {c.current * 1000:>8.2f}ms"
+                f"  {ratio:>7}{status}"
+            )
+
+        lines.append(
+            f"{len(self.regressions)} regression(s) in {len(self.comparisons)} case(s)"
+        )
+        return "\n".join(lines)
+
+
+def _symbols(n_symbols: int) -> list[str]:
+    return [f"SYM{i}/USDC:USDC" for i in range(n_symbols)]
+
+
+def strategy_cases(bar_counts) -> list[BenchmarkCase]:
+    cases = []
+    strategies = [
+        ("ema", EMATrendStrategy, False),
+        ("savgol", SavgolTrendStrategy, False),
+        ("kalman", KalmanTrendStrategy, True),
+    ]
+    for label, strategy_cls, slow in strategies:
+        for n_bars in bar_counts:
+
+            def prepare(strategy_cls=strategy_cls, n_bars=n_bars):
+                strategy = strategy_cls(config(_symbols(1)))
+                prices = history(n_bars)["close"]
+                return lambda: strategy.current_trend(prices)
+
+            cases.append(
+                BenchmarkCase(
+                    f"strategy.{label}[bars={n_bars}]",
+                    prepare,
+                    slow=slow and n_bars > 1500,
+                )
+            )
+
+    return cases
+
+
+def streaming_strategy_cases(bar_counts) -> list[BenchmarkCase]:
+    cases = []
+    for n_bars in bar_counts:
+
+        def prepare(n_bars=n_bars):
+            strategy = SavgolTrendStrategy(config(_symbols(1)))
+            prices = history(n_bars + 1).set_index("timestamp")["close"]
+            strategy.current_trends({"SYM": prices.iloc[:-1]})
+            latest = prices.iloc[1:]
+            return lambda: strategy.current_trends({"SYM": latest})
+
+        cases.append(
+            BenchmarkCase(f"strategy.savgol_streaming[bars={n_bars}]", prepare)
+        )
+
+    return cases
+
+
+def batched_strategy_cases(bar_counts, symbol_counts) -> list[BenchmarkCase]:
+    cases = []
+    for n_bars in bar_counts:
+        for n_symbols in symbol_counts:
+
+            def prepare(n_bars=n_bars, n_symbols=n_symbols):
+                symbols = _symbols(n_symbols)
+                strategy = KalmanTrendStrategy(config(symbols))
+                prices = {
+                    symbol: history(n_bars, seed=i)["close"]
+                    for i, symbol in enumerate(symbols)
+                }
+                return lambda: strategy.current_trends(prices)
+
+            cases.append(
+                BenchmarkCase(
+                    f"strategy.kalman_batched[bars={n_bars},symbols={n_symbols}]",
+                    prepare,
+                    slow=n_bars > 1500,
+                )
+            )
+
+    return cases
+
+
+def atr_cases(bar_counts) -> list[BenchmarkCase]:
+    cases = []
+    for n_bars in bar_counts:
+
+        def prepare(n_bars=n_bars):
+            symbols = _symbols(1)
+            bot = TradingBot(MockExchange(), EMATrendStrategy(config(symbols)))
+            df_ohlcv = history(n_bars)
+            price = float(df_ohlcv["close"].iloc[-1])
+            return lambda: bot.callback_rate(df_ohlcv, price)
+
+        cases.append(BenchmarkCase(f"atr.callback_rate[bars={n_bars}]", prepare))
+
+    return cases
+
+
+def exchange_cases(bar_counts) -> list[BenchmarkCase]:
+    cases = []
+    symbol = _symbols(1)[0]
+    for n_bars in bar_counts:
+
+        def prepare(n_bars=n_bars):
+            exchange = mock_exchange([symbol], n_bars)
+            return lambda: exchange.fetch_ohlcv(symbol, "1h", limit=n_bars)
+
+        cases.append(BenchmarkCase(f"exchange.fetch_ohlcv[bars={n_bars}]", prepare))
+
+    def prepare_ticker():
+        exchange = mock_exchange([symbol], 200)
+        return lambda: exchange.fetch_ticker(symbol)
+
+    def prepare_orders():
+        exchange = mock_exchange([symbol], 200)
+
+        async def round_trip():
+            await exchange.create_order(symbol, "market", "buy", 1.0)
+            await exchange.create_order(
+                symbol, "market", "sell", 1.0, params={"reduceOnly": True}
+            )
+            await exchange.fetch_positions()
+            await exchange.create_order(symbol, "market", "sell", 1.0)
+            await exchange.cancel_all_orders(symbol)
+
+        return round_trip
+
+    cases.append(BenchmarkCase("exchange.fetch_ticker", prepare_ticker))
+    cases.append(BenchmarkCase("exchange.order_round_trip", prepare_orders))
+    return cases
+
+
+def trade_cycle_cases(bar_counts, symbol_counts) -> list[BenchmarkCase]:
+    cases = []
+    for n_bars in bar_counts:
+        for n_symbols in symbol_counts:
+
+            def prepare(n_bars=n_bars, n_symbols=n_symbols):
+                symbols = _symbols(n_symbols)
+                exchange = mock_exchange(symbols, n_bars)
+                bot = TradingBot(exchange, EMATrendStrategy(config(symbols)))
+                return bot.trade
+
+            cases.append(
+                BenchmarkCase(
+                    f"bot.trade[bars={n_bars},symbols={n_symbols}]",
+                    prepare,
+                    slow=n_bars * n_symbols > 1_000_000,
+                )
+            )
+
+    return cases
+
+
+def risk_cases(symbol_counts=RISK_SYMBOL_COUNTS) -> list[BenchmarkCase]:
+    """One cycle of the risk engine after warming up on 1500 candles"""
+    cases = []
+    for n_symbols in symbol_counts:
+
+        def prepare_engine(n_symbols=n_symbols):
+            symbols = _symbols(n_symbols)
+            prices = {
+                symbol: synthetic_ohlcv(1502, seed=i).set_index("timestamp")["close"]
+                for i, symbol in enumerate(symbols)
+            }
+            engine = RiskEngine(
+                symbols, 250.0, 5, max_volatility=50.0, max_gross_notional=10_000.0
+            )
+            engine.update({symbol: c.iloc[:-1] for symbol, c in prices.items()})
+            return engine, prices
+
+        def prepare_update(prepare_engine=prepare_engine):
+            engine, prices = prepare_engine()
+            return lambda: engine.update(prices)
+
+        def prepare_sizing(prepare_engine=prepare_engine, n_symbols=n_symbols):
+            engine, prices = prepare_engine()
+            rng = np.random.default_rng(0)
+            signals = rng.choice([-1, 0, 1], n_symbols)
+            latest = np.array([c.iloc[-1] for c in prices.values()])
+            held = np.where(signals == 0, rng.normal(0, 250, n_symbols), 0.0)
+            return lambda: engine.target_notionals(signals, latest, held)
+
+        cases.append(BenchmarkCase(f"risk.update[symbols={n_symbols}]", prepare_update))
+        cases.append(
+            BenchmarkCase(f"risk.target_notionals[symbols={n_symbols}]", prepare_sizing)
+        )
+
+    return cases
+
+
+def all_cases(bar_counts=BAR_COUNTS, symbol_counts=SYMBOL_COUNTS) -> list:
+    return (
+        strategy_cases(bar_counts)
+        + streaming_strategy_cases(bar_counts)
+        + batched_strategy_cases(bar_counts, symbol_counts)
+        + atr_cases(bar_counts)
+        + exchange_cases(bar_counts)
+        + trade_cycle_cases(bar_counts, symbol_counts)
+        + risk_cases()
+    )
+
+
+def run_case(
+    case: BenchmarkCase,
+    loop: asyncio.AbstractEventLoop,
+    repeat: int = 5,
+    budget: float = 5.0,
+) -> BenchmarkResult:
+    """Time a case on fresh state per run, within a time budget per case"""
+    timings = []
+    while len(timings) < repeat:
+        fn = case.prepare()
+        start = time.perf_counter()
+        result = fn()
+        if asyncio.iscoroutine(result):
+            loop.run_until_complete(result)
+        timings.append(time.perf_counter() - start)
+
+        if sum(timings) > budget:
+            break
+
+    return BenchmarkResult(
+        case.name, float(np.median(timings)), min(timings), len(timings)
+    )
+
+
+def run(
+    cases: list[BenchmarkCase], repeat: int = 5, budget: float = 5.0
+) -> list[BenchmarkResult]:
+    loop = asyncio.new_event_loop()
+    try:
+        return [run_case(case, loop, repeat, budget) for case in cases]
+    finally:
+        loop.close()
+
+
+def load_baselines(path: Path = BASELINE_FILE) -> dict[str, float]:
+    if not path.exists():
+        return {}
+
+    with path.open() as f:
+        return json.load(f)["cases"]
+
+
+def save_baselines(results: list[BenchmarkResult], path: Path = BASELINE_FILE) -> None:
+    baselines = load_baselines(path)
+    baselines.update({result.name: result.median for result in results})
+    data = {
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+        },
+        "cases": dict(sorted(baselines.items())),
+    }
+    with path.open("w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def compare(
+    results: list[BenchmarkResult],
+    baselines: dict[str, float],
+    tolerance: float = 0.5,
+    noise_floor: float = 0.001,
+) -> Report:
+    """Flag cases whose median is slower than baseline by more than tolerance
+
+    Slowdowns of less than `noise_floor` seconds are ignored, sub-millisecond
+    cases easily vary by more than the tolerance between runs.
+    """
+    report = Report()
+    for result in results:
+        baseline = baselines.get(result.name)
+        regression = (
+            baseline is not None
+            and result.median > baseline * (1 + tolerance)
+            and result.median - baseline > noise_floor
+        )
+        report.comparisons.append(
+            Comparison(result.name, result.median, baseline, regression)
+        )
+
+    return report
@@ -0,0 +1,28 @@
+from tests.benchmarks.suite import BenchmarkResult, compare
+
+
+def result(name: str, median: float) -> BenchmarkResult:
+    return BenchmarkResult(name, median, median, 5)
+
+
+def test_compare_flags_regressions_above_noise_floor():
+    baselines = {"fast": 0.0002, "slow": 0.1, "steady": 0.1}
+    results = [
+        result("fast", 0.0006),
+        result("slow", 0.2),
+        result("steady", 0.12),
+        result("added", 0.01),
+    ]
+    report = compare(results, baselines, tolerance=0.5)
+
+    assert [c.name for c in report.regressions] == ["slow"]
+    assert report.comparisons[1].ratio == 2.0
+    assert report.comparisons[3].ratio is None
+
+    lines = report.format().splitlines()
+    assert "REGRESSION" in lines[2] and "new" in lines[4]
+    assert lines[-1] == "1 regression(s) in 4 case(s)"
+
+    # Without a noise floor the sub-millisecond slowdown counts too
+    report = compare(results, baselines, tolerance=0.5, noise_floor=0.0)
+    assert [c.name for c in report.regressions] == ["fast", "slow"]
@@ -0,0 +1,32 @@
+import asyncio
+import dataclasses
+
+from src.bots.trading_bot import TradingBot
+from src.strategies.momentum_strategies import EMATrendStrategy
+from tests.helpers import config, mock_exchange
+
+SYMBOLS = [f"SYM{i}/USDC:USDC" for i in range(5)]
+
+
+def market_data_requests(price_source: str) -> dict[str, int]:
+    exchange = mock_exchange(SYMBOLS, 200)
+    cfg = dataclasses.replace(
+        config(SYMBOLS, enable_trading=False), price_source=price_source
+    )
+    bot = TradingBot(exchange, EMATrendStrategy(cfg))
+    asyncio.run(bot.trade())
+    return dict(exchange.requests)
+
+
+def test_prices_from_one_tickers_request():
+    requests = market_data_requests("tickers")
+    assert requests == {
+        "fetch_positions": 1,
+        "fetch_tickers": 1,
+        "fetch_ohlcv": len(SYMBOLS),
+    }
+
+
+def test_prices_from_candles():
+    requests = market_data_requests("ohlcv")
+    assert requests == {"fetch_positions": 1, "fetch_ohlcv": len(SYMBOLS)}
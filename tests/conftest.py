@@ -0,0 +1,31 @@
+import pytest
+
+from src.models.config import Config
+
+
+@pytest.fixture
+def config():
+    symbols = ["SUI/USDC:USDC"]
+    rate = "1h"
+    timeframe = "1h"
+    leverage = 5
+    position_notional_value = 10
+    atr_stop_loss = 1.5
+    enable_trading = False
+    params = {
+        "ema_window": 8,
+        "smooth_window": 11,
+        "polyorder": 5,
+    }
+
+    config = Config(
+        symbols=symbols,
+        rate=rate,
+        timeframe=timeframe,
+        leverage=leverage,
+        position_notional_value=position_notional_value,
+        atr_stop_loss=atr_stop_loss,
+        enable_trading=enable_trading,
+        params=params,
+    )
+    return config
@@ -0,0 +1,56 @@
+import asyncio
+import ccxt
+import pytest
+
+from src.bots.trading_bot import TradingBot
+from src.strategies.momentum_strategies import EMATrendStrategy
+from tests.helpers import config, synthetic_ohlcv
+from tests.http_exchange import BinanceStandIn
+from tests.mock_exchange import MockExchange
+
+SYMBOLS = ["SOL/USDC:USDC", "SUI/USDC:USDC"]
+
+
+@pytest.fixture
+def mock_exchange():
+    exchange = MockExchange()
+    for i, symbol in enumerate(SYMBOLS):
+        exchange.set_ohlcv(symbol, synthetic_ohlcv(300, seed=i))
+    return exchange
+
+
+def test_trading_bot_through_stand_in(mock_exchange):
+    async def run():
+        stand_in = BinanceStandIn(mock_exchange)
+        await stand_in.start()
+        exchange = stand_in.client({"enableRateLimit": False})
+        try:
+            bot = TradingBot(exchange, EMATrendStrategy(config(SYMBOLS)))
+            await bot.on_start()
+            positions = await exchange.fetch_positions()
+        finally:
+            await exchange.close()
+            await stand_in.stop()
+        return stand_in, bot, positions
+
+    stand_in, bot, positions = asyncio.run(run())
+    assert set(bot.markets) == set(SYMBOLS)
+    assert stand_in.leverage == {symbol: 5 for symbol in SYMBOLS}
+    assert stand_in.requests["GET /fapi/v1/klines"] == len(SYMBOLS)
+    assert stand_in.requests["GET /fapi/v1/ticker/24hr"] == 1
+    assert {p["symbol"] for p in positions} == set(mock_exchange.positions)
+
+
+def test_stand_in_error_injection(mock_exchange):
+    async def run():
+        stand_in = BinanceStandIn(mock_exchange, error_rate=1.0)
+        await stand_in.start()
+        exchange = stand_in.client({"enableRateLimit": False})
+        try:
+            await exchange.fetch_ohlcv(SYMBOLS[0], "1h", limit=100)
+        finally:
+            await exchange.close()
+            await stand_in.stop()
+
+    with pytest.raises(ccxt.BaseError):
+        asyncio.run(run())
@@ -0,0 +1,45 @@
+import time
+import asyncio
+import pytest
+
+from src.bots.trading_bot import TradingBot
+from src.strategies.momentum_strategies import EMATrendStrategy
+from src.exchanges.recording import RecordingExchange, ReplayExchange
+from tests.helpers import bundled_ohlcv, config
+from tests.mock_exchange import MockExchange
+
+SYMBOL = "SOL/USDC:USDC"
+
+
+@pytest.fixture
+def recording(tmp_path):
+    exchange = MockExchange()
+    exchange.set_ohlcv(SYMBOL, bundled_ohlcv().iloc[:200])
+    path = tmp_path / "session.jsonl"
+    recorder = RecordingExchange(exchange, path)
+    bot = TradingBot(recorder, EMATrendStrategy(config([SYMBOL])))
+    asyncio.run(bot.trade())
+    return path, exchange
+
+
+def test_replay_reproduces_recorded_session(recording):
+    path, exchange = recording
+    assert path.read_text().count("\n") > 0
+    assert SYMBOL in exchange.positions
+
+    replay = ReplayExchange(path, speed=None)
+    bot = TradingBot(replay, EMATrendStrategy(config([SYMBOL])))
+    asyncio.run(bot.trade())
+    assert replay.calls["create_order"] == 2
+    assert replay.calls["fetch_ohlcv"] == 1
+
+
+def test_replay_speed(recording):
+    path, _ = recording
+    replay = ReplayExchange(path, speed=None)
+    start = time.perf_counter()
+    asyncio.run(replay.fetch_positions())
+    assert time.perf_counter() - start < 0.1
+
+    with pytest.raises(KeyError):
+        asyncio.run(replay.fetch_ohlcv("BTC/USDC:USDC", "1h", limit=1500))
@@ -0,0 +1,141 @@
+import asyncio
+import ccxt
+
+from src.executions.orders import OrderBatcher, OrderExecutor, SymbolOrders
+from src.models.exchange import OrderType, Side
+from tests.helpers import synthetic_ohlcv
+from tests.http_exchange import BinanceStandIn
+from tests.mock_exchange import MockExchange
+
+SYMBOLS = [f"SYM{i}/USDC:USDC" for i in range(7)]
+
+
+def mock_exchange() -> MockExchange:
+    exchange = MockExchange()
+    for i, symbol in enumerate(SYMBOLS):
+        exchange.set_ohlcv(symbol, synthetic_ohlcv(50, seed=i))
+    return exchange
+
+
+def entry(symbol: str, amount: float = 1.0) -> list[dict]:
+    return [
+        {
+            "symbol": symbol,
+            "type": OrderType.MARKET,
+            "side": Side.BUY,
+            "amount": amount,
+        },
+        {
+            "symbol": symbol,
+            "type": OrderType.MARKET,
+            "side": Side.SELL,
+            "amount": amount,
+            "params": {"callbackRate": 1.0, "reduceOnly": True},
+        },
+    ]
+
+
+def open_short(exchange: MockExchange, symbol: str) -> None:
+    asyncio.run(exchange.create_order(symbol, "market", "sell", 2.0))
+    asyncio.run(
+        exchange.create_order(
+            symbol,
+            "market",
+            "buy",
+            2.0,
+            params={"callbackRate": 1.0, "reduceOnly": True},
+        )
+    )
+
+
+def close(symbol: str, amount: float) -> dict:
+    return {
+        "symbol": symbol,
+        "type": OrderType.MARKET,
+        "side": Side.BUY,
+        "amount": amount,
+    }
+
+
+def test_entries_are_batched_and_stops_sent_alone():
+    exchange = mock_exchange()
+    executor = OrderExecutor(exchange)
+    orders = [SymbolOrders(symbol, open=entry(symbol)) for symbol in SYMBOLS]
+
+    report = asyncio.run(executor.execute(orders))
+
+    assert not report.failed
+    assert [len(batch) for batch in exchange.order_batches] == [5, 2]
+    assert set(exchange.positions) == set(SYMBOLS)
+    assert all(len(exchange.open_orders[symbol]) == 1 for symbol in SYMBOLS)
+    assert executor.first_order_at is not None
+
+
+def test_rejected_close_only_aborts_its_symbol():
+    exchange = mock_exchange()
+    for symbol in SYMBOLS[:3]:
+        open_short(exchange, symbol)
+
+    # The close of the first symbol has the wrong amount and gets rejected
+    orders = [
+        SymbolOrders(symbol, close(symbol, 3.0 if i == 0 else 2.0), entry(symbol))
+        for i, symbol in enumerate(SYMBOLS[:3])
+    ]
+    report = asyncio.run(OrderExecutor(exchange).execute(orders))
+
+    assert list(report.failed) == [SYMBOLS[0]]
+    assert exchange.positions[SYMBOLS[0]].side == "short"
+    assert len(exchange.open_orders[SYMBOLS[0]]) == 1
+    assert len(exchange.trade_history) == 2
+    for symbol in SYMBOLS[1:3]:
+        assert exchange.positions[symbol].side == "long"
+
+
+class ShortResponseExchange(MockExchange):
+    async def create_orders(self, orders: list[dict], params: dict | None = None):
+        return (await super().create_orders(orders, params))[:-1]
+
+
+def test_orders_missing_from_batch_response_fail():
+    exchange = ShortResponseExchange()
+    for i, symbol in enumerate(SYMBOLS[:3]):
+        exchange.set_ohlcv(symbol, synthetic_ohlcv(50, seed=i))
+
+    async def run():
+        batcher = OrderBatcher(exchange)
+        submits = [batcher.submit(entry(symbol)[0]) for symbol in SYMBOLS[:3]]
+        return await asyncio.wait_for(
+            asyncio.gather(*submits, return_exceptions=True), timeout=1
+        )
+
+    *placed, missing = asyncio.run(run())
+    assert all(result["id"] is not None for result in placed)
+    assert isinstance(missing, ccxt.ExchangeError)
+
+
+def test_batch_rejections_through_stand_in():
+    exchange = mock_exchange()
+    open_short(exchange, SYMBOLS[0])
+
+    async def run():
+        stand_in = BinanceStandIn(exchange)
+        await stand_in.start()
+        client = stand_in.client({"enableRateLimit": False})
+        try:
+            await client.load_markets()
+            orders = [
+                SymbolOrders(SYMBOLS[0], close(SYMBOLS[0], 3.0), entry(SYMBOLS[0]))
+            ]
+            orders += [
+                SymbolOrders(symbol, open=entry(symbol)) for symbol in SYMBOLS[1:4]
+            ]
+            report = await OrderExecutor(client).execute(orders)
+        finally:
+            await client.close()
+            await stand_in.stop()
+        return stand_in, report
+
+    stand_in, report = asyncio.run(run())
+    assert list(report.failed) == [SYMBOLS[0]]
+    assert stand_in.requests["POST /fapi/v1/batchOrders"] == 1
+    assert set(exchange.positions) == set(SYMBOLS[:4])
@@ -0,0 +1,84 @@
+import time
+import asyncio
+
+from src.bots.trading_bot import TradingBot
+from src.executions.schedule import CandleCloseScheduler
+from src.monitoring.metrics import MISSED_RUNS, DEFERRED_SYMBOLS
+from src.strategies.momentum_strategies import EMATrendStrategy
+from tests.helpers import config, mock_exchange
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        # Wake up a little late, like a busy event loop
+        self.now += seconds + 0.01
+        await asyncio.sleep(0)
+
+
+def run_scheduler(clock: FakeClock, durations: list[float], **kwargs) -> list:
+    runs = []
+
+    async def job(deadline):
+        runs.append((clock.now, deadline))
+        clock.now += durations[len(runs) - 1]
+
+    async def main():
+        scheduler = CandleCloseScheduler(
+            job, "1m", clock=clock, sleep=clock.sleep, **kwargs
+        )
+        scheduler.start()
+        while len(runs) < len(durations):
+            await asyncio.sleep(0)
+        await scheduler.stop()
+
+    asyncio.run(main())
+    return runs
+
+
+def test_runs_at_candle_close_plus_offset():
+    clock = FakeClock(1_000.3)
+    runs = run_scheduler(clock, [5.0, 5.0, 5.0], offset=2.0, deadline=30.0)
+
+    assert [round(start, 2) for start, _ in runs] == [1022.01, 1082.01, 1142.01]
+    assert [deadline for _, deadline in runs] == [1052.0, 1112.0, 1172.0]
+
+
+def test_overrunning_cycles_are_coalesced():
+    clock = FakeClock(1_000.0)
+    missed = MISSED_RUNS.get()
+    runs = run_scheduler(clock, [150.0, 5.0, 5.0], offset=1.0)
+
+    # The second run starts right away for the latest missed close
+    assert [round(start, 2) for start, _ in runs] == [1021.01, 1171.01, 1201.01]
+    assert MISSED_RUNS.get() == missed + 1
+
+
+def test_symbols_past_deadline_are_deferred(monkeypatch):
+    symbols = [f"SYM{i}/USDC:USDC" for i in range(5)]
+    bot = TradingBot(
+        mock_exchange(symbols, 200),
+        EMATrendStrategy(config(symbols, enable_trading=False)),
+    )
+
+    # Every deadline check advances the clock by one second
+    now = [0.0]
+
+    def fake_time():
+        now[0] += 1
+        return now[0]
+
+    monkeypatch.setattr(time, "time", fake_time)
+    deferred = DEFERRED_SYMBOLS.get(symbol=symbols[2])
+    asyncio.run(bot.trade(deadline=2.5))
+    assert bot.deferred == symbols[2:]
+    assert DEFERRED_SYMBOLS.get(symbol=symbols[2]) == deferred + 1
+
+    assert bot._cycle_symbols() == symbols[2:] + symbols[:2]
+    asyncio.run(bot.trade())
+    assert bot.deferred == []
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from src.models.config import Config
+from tests.mock_exchange import MockExchange
+
+DATA_FILE = Path(__file__).parent / "data" / "ohlcv-1h-sol-usdc-usdc.csv"
+COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+TIMEFRAME_MS = 3_600_000
+
+
+def bundled_ohlcv() -> pd.DataFrame:
+    return pd.read_csv(DATA_FILE)[COLUMNS]
+
+
+def synthetic_ohlcv(n_bars: int, seed: int = 0) -> pd.DataFrame:
+    """Geometric random walk candles with a realistic intrabar range"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = np.abs(rng.normal(0, 0.005, n_bars)) * close
+    timestamp = 1_700_000_000_000 + TIMEFRAME_MS * np.arange(n_bars)
+    return pd.DataFrame(
+        {
+            "timestamp": timestamp,
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": rng.uniform(1_000, 100_000, n_bars),
+        }
+    )
+
+
+def history(n_bars: int, seed: int = 0) -> pd.DataFrame:
+    """Bundled SOL candles where long enough, synthetic candles otherwise"""
+    bundled = bundled_ohlcv()
+    if seed == 0 and n_bars <= len(bundled):
+        return bundled.tail(n_bars).reset_index(drop=True)
+
+    return synthetic_ohlcv(n_bars, seed)
+
+
+def config(symbols: list[str], enable_trading: bool = True) -> Config:
+    return Config(
+        symbols=symbols,
+        rate="0 * * * *",
+        timeframe="1h",
+        leverage=5,
+        position_notional_value=250.0,
+        atr_stop_loss=1.4,
+        enable_trading=enable_trading,
+        params={"ema_window": 8, "smooth_window": 12, "polyorder": 5},
+    )
+
+
+def mock_exchange(symbols: list[str], n_bars: int) -> MockExchange:
+    exchange = MockExchange()
+    for i, symbol in enumerate(symbols):
+        exchange.set_ohlcv(symbol, history(n_bars, seed=i))
+
+    return exchange
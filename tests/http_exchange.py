@@ -0,0 +1,446 @@
+import json
+import time
+import random
+import asyncio
+import ccxt.async_support as ccxt
+from aiohttp import web
+from loguru import logger
+
+from tests.mock_exchange import MockExchange
+
+TIMEFRAME_MS = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "2h": 7_200_000,
+    "4h": 14_400_000,
+    "1d": 86_400_000,
+}
+
+
+def market_id(symbol: str) -> str:
+    """Binance id of a unified symbol, e.g. 'SOL/USDC:USDC' -> 'SOLUSDC'"""
+    base, quote = symbol.split(":")[0].split("/")
+    return base + quote
+
+
+class BinanceStandIn:
+    """Local HTTP server which mimics the Binance USDⓈ-M endpoints used by the bot
+
+    Orders, positions and candles live in a MockExchange, so the stand-in
+    behaves like the backtests while ccxt runs its full HTTP, signing and
+    parsing code path. Every request is delayed by `latency` plus up to
+    `jitter` seconds and fails with `error_status` at `error_rate`.
+    """
+
+    def __init__(
+        self,
+        exchange: MockExchange | None = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int | None = None,
+    ) -> None:
+        self.exchange = exchange or MockExchange()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+
+        self.requests: dict[str, int] = {}
+        self.errors = 0
+        self.leverage: dict[str, int] = {}
+        self.margin_type: dict[str, str] = {}
+        self._order_id = 0
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.add_routes(
+            [
+                web.get("/fapi/v1/ping", self.ping),
+                web.get("/fapi/v1/time", self.server_time),
+                web.get("/fapi/v1/exchangeInfo", self.exchange_info),
+                web.get("/fapi/v1/ticker/24hr", self.ticker_24hr),
+                web.get("/fapi/v1/ticker/price", self.ticker_price),
+                web.get("/fapi/v1/klines", self.klines),
+                web.get("/fapi/v1/leverageBracket", self.leverage_bracket),
+                web.get("/fapi/v2/positionRisk", self.position_risk),
+                web.get("/fapi/v3/positionRisk", self.position_risk),
+                web.post("/fapi/v1/leverage", self.set_leverage),
+                web.post("/fapi/v1/marginType", self.set_margin_type),
+                web.post("/fapi/v1/order", self.create_order),
+                web.post("/fapi/v1/algoOrder", self.create_order),
+                web.post("/fapi/v1/batchOrders", self.create_orders),
+                web.delete("/fapi/v1/allOpenOrders", self.cancel_all_orders),
+                web.delete("/fapi/v1/algoOpenOrders", self.cancel_all_orders),
+            ]
+        )
+        self.runner: web.AppRunner | None = None
+        self.url: str | None = None
+
+    @property
+    def symbols(self) -> dict[str, str]:
+        return {market_id(symbol): symbol for symbol in self.exchange.ohlcv_map}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self.runner = web.AppRunner(self.app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        logger.info(f"Binance stand-in listening on {self.url}")
+        return self.url
+
+    async def stop(self) -> None:
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+    def client(self, config: dict | None = None) -> ccxt.binance:
+        """ccxt.binance instance which sends all USDⓈ-M requests to this server"""
+        exchange = ccxt.binance(
+            {
+                "apiKey": "stand-in-key",
+                "secret": "stand-in-secret",
+                "options": {
+                    "defaultType": "swap",
+                    "fetchMarkets": {"types": ["linear"]},
+                    "fetchCurrencies": False,
+                },
+                **(config or {}),
+            }
+        )
+        for name, url in exchange.urls["api"].items():
+            if isinstance(url, str) and url.startswith("https://fapi.binance.com"):
+                exchange.urls["api"][name] = url.replace(
+                    "https://fapi.binance.com", self.url
+                )
+
+        return exchange
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        route = f"{request.method} {request.path}"
+        self.requests[route] = self.requests.get(route, 0) + 1
+
+        delay = self.latency + self.random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.errors += 1
+            return web.json_response(
+                {"code": -1001, "msg": "Internal error; injected by stand-in"},
+                status=self.error_status,
+            )
+
+        return await handler(request)
+
+    async def _params(self, request: web.Request) -> dict:
+        params = dict(request.query)
+        if request.can_read_body:
+            params.update(await request.post())
+        return params
+
+    def _symbol(self, params: dict) -> str:
+        if (symbol := self.symbols.get(params.get("symbol", ""))) is None:
+            raise web.HTTPBadRequest(
+                text='{"code":-1121,"msg":"Invalid symbol."}',
+                content_type="application/json",
+            )
+        return symbol
+
+    def _next_order_id(self) -> int:
+        self._order_id += 1
+        return self._order_id
+
+    async def ping(self, request: web.Request) -> web.Response:
+        return web.json_response({})
+
+    async def server_time(self, request: web.Request) -> web.Response:
+        return web.json_response({"serverTime": int(time.time() * 1000)})
+
+    async def exchange_info(self, request: web.Request) -> web.Response:
+        markets = []
+        for id, symbol in self.symbols.items():
+            base, quote = symbol.split(":")[0].split("/")
+            markets.append(
+                {
+                    "symbol": id,
+                    "pair": id,
+                    "contractType": "PERPETUAL",
+                    "deliveryDate": 4133404800000,
+                    "onboardDate": 1569398400000,
+                    "status": "TRADING",
+                    "baseAsset": base,
+                    "quoteAsset": quote,
+                    "marginAsset": quote,
+                    "pricePrecision": 4,
+                    "quantityPrecision": 3,
+                    "baseAssetPrecision": 8,
+                    "quotePrecision": 8,
+                    "underlyingType": "COIN",
+                    "triggerProtect": "0.0500",
+                    "filters": [
+                        {
+                            "filterType": "PRICE_FILTER",
+                            "minPrice": "0.0010",
+                            "maxPrice": "100000",
+                            "tickSize": "0.0010",
+                        },
+                        {
+                            "filterType": "LOT_SIZE",
+                            "minQty": "0.001",
+                            "maxQty": "1000000",
+                            "stepSize": "0.001",
+                        },
+                        {
+                            "filterType": "MARKET_LOT_SIZE",
+                            "minQty": "0.001",
+                            "maxQty": "100000",
+                            "stepSize": "0.001",
+                        },
+                        {"filterType": "MIN_NOTIONAL", "notional": "5"},
+                    ],
+                    "orderTypes": ["LIMIT", "MARKET", "TRAILING_STOP_MARKET"],
+                    "timeInForce": ["GTC", "IOC", "FOK", "GTX"],
+                }
+            )
+
+        return web.json_response(
+            {
+                "timezone": "UTC",
+                "serverTime": int(time.time() * 1000),
+                "rateLimits": [],
+                "exchangeFilters": [],
+                "assets": [],
+                "symbols": markets,
+            }
+        )
+
+    def _ticker(self, symbol: str) -> dict:
+        ohlcv = self.exchange.ohlcv_map[symbol]
+        last = ohlcv.iloc[-1]
+        first = ohlcv.iloc[max(len(ohlcv) - 24, 0)]
+        return {
+            "symbol": market_id(symbol),
+            "priceChange": str(last["close"] - first["open"]),
+            "priceChangePercent": str(100 * (last["close"] / first["open"] - 1)),
+            "weightedAvgPrice": str(last["close"]),
+            "lastPrice": str(last["close"]),
+            "lastQty": "1",
+            "openPrice": str(first["open"]),
+            "highPrice": str(ohlcv["high"].tail(24).max()),
+            "lowPrice": str(ohlcv["low"].tail(24).min()),
+            "volume": str(ohlcv["volume"].tail(24).sum()),
+            "quoteVolume": "0",
+            "openTime": int(first["timestamp"]),
+            "closeTime": int(last["timestamp"]),
+            "firstId": 1,
+            "lastId": 1,
+            "count": 1,
+        }
+
+    async def ticker_24hr(self, request: web.Request) -> web.Response:
+        params = await self._params(request)
+        if "symbol" in params:
+            return web.json_response(self._ticker(self._symbol(params)))
+
+        return web.json_response([self._ticker(s) for s in self.symbols.values()])
+
+    async def ticker_price(self, request: web.Request) -> web.Response:
+        params = await self._params(request)
+        symbols = (
+            [self._symbol(params)] if "symbol" in params else self.symbols.values()
+        )
+        prices = [
+            {
+                "symbol": market_id(symbol),
+                "price": str(self.exchange.current_price(symbol)),
+                "time": int(time.time() * 1000),
+            }
+            for symbol in symbols
+        ]
+        return web.json_response(prices[0] if "symbol" in params else prices)
+
+    async def klines(self, request: web.Request) -> web.Response:
+        params = await self._params(request)
+        symbol = self._symbol(params)
+        limit = int(params.get("limit", 500))
+        duration = TIMEFRAME_MS.get(params.get("interval", "1h"), 3_600_000)
+        ohlcv = self.exchange.ohlcv_map[symbol].tail(limit)
+        return web.json_response(
+            [
+                [
+                    int(timestamp),
+                    str(open_),
+                    str(high),
+                    str(low),
+                    str(close),
+                    str(volume),
+                    int(timestamp) + duration - 1,
+                    "0",
+                    1,
+                    "0",
+                    "0",
+                    "0",
+                ]
+                for timestamp, open_, high, low, close, volume in ohlcv[
+                    ["timestamp", "open", "high", "low", "close", "volume"]
+                ].itertuples(index=False)
+            ]
+        )
+
+    async def leverage_bracket(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            [
+                {
+                    "symbol": id,
+                    "brackets": [
+                        {
+                            "bracket": 1,
+                            "initialLeverage": 50,
+                            "notionalCap": 1_000_000,
+                            "notionalFloor": 0,
+                            "maintMarginRatio": 0.01,
+                            "cum": 0.0,
+                        }
+                    ],
+                }
+                for id in self.symbols
+            ]
+        )
+
+    async def position_risk(self, request: web.Request) -> web.Response:
+        positions = []
+        for position in await self.exchange.fetch_positions():
+            sign = 1 if position["side"] == "long" else -1
+            amount = sign * position["contracts"]
+            mark_price = self.exchange.current_price(position["symbol"])
+            positions.append(
+                {
+                    "symbol": market_id(position["symbol"]),
+                    "positionSide": "BOTH",
+                    "positionAmt": str(amount),
+                    "entryPrice": str(position["entryPrice"]),
+                    "breakEvenPrice": str(position["entryPrice"]),
+                    "markPrice": str(mark_price),
+                    "unRealizedProfit": str(
+                        amount * (mark_price - position["entryPrice"])
+                    ),
+                    "liquidationPrice": "0",
+                    "isolatedMargin": "0",
+                    "notional": str(amount * mark_price),
+                    "marginAsset": position["symbol"].split(":")[1],
+                    "isolatedWallet": "0",
+                    "initialMargin": "0",
+                    "maintMargin": "0",
+                    "positionInitialMargin": "0",
+                    "openOrderInitialMargin": "0",
+                    "adl": 0,
+                    "bidNotional": "0",
+                    "askNotional": "0",
+                    "updateTime": int(time.time() * 1000),
+                }
+            )
+
+        return web.json_response(positions)
+
+    async def set_leverage(self, request: web.Request) -> web.Response:
+        params = await self._params(request)
+        symbol = self._symbol(params)
+        self.leverage[symbol] = int(params["leverage"])
+        await self.exchange.set_leverage(self.leverage[symbol], symbol)
+        return web.json_response(
+            {
+                "symbol": params["symbol"],
+                "leverage": self.leverage[symbol],
+                "maxNotionalValue": "1000000",
+            }
+        )
+
+    async def set_margin_type(self, request: web.Request) -> web.Response:
+        params = await self._params(request)
+        symbol = self._symbol(params)
+        self.margin_type[symbol] = params["marginType"]
+        await self.exchange.set_margin_mode(params["marginType"].lower(), symbol)
+        return web.json_response({"code": 200, "msg": "success"})
+
+    async def create_order(self, request: web.Request) -> web.Response:
+        params = await self._params(request)
+        return web.json_response(await self._create_order(params))
+
+    async def _create_order(self, params: dict) -> dict:
+        symbol = self._symbol(params)
+        amount = float(params["quantity"])
+        order_params = {}
+        if "callbackRate" in params:
+            order_params["callbackRate"] = float(params["callbackRate"])
+        reduce_only = str(params.get("reduceOnly")).lower() == "true"
+        if reduce_only:
+            order_params["reduceOnly"] = True
+
+        result = await self.exchange.create_order(
+            symbol,
+            params["type"].lower(),
+            params["side"].lower(),
+            amount,
+            params=order_params,
+        )
+        if not result:
+            raise web.HTTPBadRequest(
+                text='{"code":-2022,"msg":"ReduceOnly Order is rejected."}',
+                content_type="application/json",
+            )
+
+        order_id = self._next_order_id()
+        is_conditional = "callbackRate" in params
+        now = int(time.time() * 1000)
+        price = str(self.exchange.current_price(symbol))
+        return {
+            "orderId": order_id,
+            "symbol": params["symbol"],
+            "status": "NEW" if is_conditional else "FILLED",
+            "clientOrderId": params.get("newClientOrderId", f"stand-in-{order_id}"),
+            "price": "0",
+            "avgPrice": "0" if is_conditional else price,
+            "origQty": params["quantity"],
+            "executedQty": "0" if is_conditional else params["quantity"],
+            "cumQuote": "0",
+            "timeInForce": "GTC",
+            "type": params["type"],
+            "origType": params["type"],
+            "reduceOnly": reduce_only,
+            "closePosition": False,
+            "side": params["side"],
+            "positionSide": "BOTH",
+            "stopPrice": "0",
+            "workingType": "CONTRACT_PRICE",
+            "priceProtect": False,
+            "priceRate": params.get("callbackRate", "0"),
+            "updateTime": now,
+        }
+
+    async def create_orders(self, request: web.Request) -> web.Response:
+        params = await self._params(request)
+        results = []
+        for order in json.loads(params["batchOrders"]):
+            # Rejected orders are answered inline, the batch itself succeeds
+            try:
+                results.append(await self._create_order(order))
+            except web.HTTPBadRequest as e:
+                results.append(json.loads(e.text))
+
+        return web.json_response(results)
+
+    async def cancel_all_orders(self, request: web.Request) -> web.Response:
+        params = await self._params(request)
+        await self.exchange.cancel_all_orders(self._symbol(params))
+        return web.json_response(
+            {"code": 200, "msg": "The operation of cancel all open order is done."}
+        )
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.market_data.resampler import CandleResampler
+from tests.helpers import synthetic_ohlcv
+
+PANDAS_RULES = {"1m": "1min", "5m": "5min", "15m": "15min", "1h": "1h", "4h": "4h"}
+OHLCV = ["open", "high", "low", "close", "volume"]
+
+
+def minute_candles(n_bars: int) -> pd.DataFrame:
+    """Minute candles starting 7 minutes past a full hour"""
+    ohlcv = synthetic_ohlcv(n_bars)
+    start = 1_700_000_000_000 - 1_700_000_000_000 % 3_600_000 + 7 * 60_000
+    ohlcv["timestamp"] = start + 60_000 * np.arange(n_bars)
+    return ohlcv
+
+
+def resample(ohlcv: pd.DataFrame, rule: str) -> pd.DataFrame:
+    df = ohlcv.set_index(pd.to_datetime(ohlcv["timestamp"], unit="ms"))
+    agg = df.resample(rule, label="left", closed="left").agg(
+        {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+    )
+    agg["timestamp"] = (agg.index - pd.Timestamp(0)) // pd.Timedelta("1ms")
+    return agg.reset_index(drop=True)
+
+
+def test_resampled_candles_match_pandas():
+    ohlcv = minute_candles(3000)
+    rows = ohlcv.values.tolist()
+    resampler = CandleResampler("1m", ["5m", "15m", "1h", "4h"])
+
+    # Overlapping windows, as returned by consecutive fetches
+    for end in range(100, len(rows) + 1, 37):
+        resampler.update(rows[max(0, end - 200) : end])
+    resampler.update(rows[-200:])
+
+    for timeframe, rule in PANDAS_RULES.items():
+        candles = resampler.frame(timeframe)
+        expected = resample(ohlcv, rule)
+        expected = expected[expected["timestamp"].isin(candles["timestamp"])]
+
+        assert len(candles) == len(expected) > 0
+        np.testing.assert_allclose(candles[OHLCV].values, expected[OHLCV].values)
+
+        # Leading buckets without their first base candle are left out
+        assert candles["timestamp"].iloc[0] >= ohlcv["timestamp"].iloc[0]
+
+
+def test_seeded_timeframe_continues_from_base_stream():
+    ohlcv = minute_candles(3000)
+    hourly = resample(ohlcv, "1h")
+    resampler = CandleResampler("1m", ["1h"])
+
+    # Seed complete hours, then only stream the last 600 minutes
+    seed = hourly[hourly["timestamp"] <= ohlcv["timestamp"].iloc[2500]].iloc[1:]
+    resampler.seed("1h", seed[["timestamp", *OHLCV]].values.tolist())
+    resampler.update(ohlcv.values.tolist()[2400:])
+
+    candles = resampler.frame("1h")
+    np.testing.assert_array_equal(candles["timestamp"], hourly["timestamp"][1:])
+    np.testing.assert_allclose(candles[OHLCV].values, hourly[OHLCV].values[1:])
+
+
+def test_missing_limits_fetch_to_new_candles():
+    ohlcv = minute_candles(100)
+    resampler = CandleResampler("1m", ["5m"], maxlen=1500)
+    assert resampler.missing(0) == 1500
+
+    resampler.update(ohlcv.values.tolist()[:90])
+    now = int(ohlcv["timestamp"].iloc[-1])
+    limit = resampler.missing(now)
+    assert limit < 20
+
+    # The latest candles reach back to the last committed one
+    latest = ohlcv.iloc[-limit:]
+    assert latest["timestamp"].iloc[0] <= resampler.last_timestamp
+
+
+def test_timeframe_must_be_multiple_of_base():
+    with pytest.raises(ValueError):
+        CandleResampler("3m", ["5m"])
@@ -0,0 +1,67 @@
+import pickle
+import numpy as np
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+
+from src.market_data.shared import CandleRegistry, SharedCandles
+from tests.helpers import history
+
+
+def stats(candles: np.ndarray) -> tuple[float, bool, bool]:
+    return candles[:, 4].sum(), candles.flags.writeable, candles.flags.owndata
+
+
+def close_sum(handle: SharedCandles, symbol: str) -> tuple[float, bool, bool]:
+    # The view is released once `stats` returns, before the attachment closes
+    with handle.attach() as shared:
+        return stats(shared[symbol])
+
+
+def test_registry_shares_read_only_views():
+    ohlcv_map = {f"SYM{i}/USDC:USDC": history(300, seed=i) for i in range(3)}
+    returns = np.linspace(-0.01, 0.01, 11, dtype=np.float32)
+
+    with CandleRegistry({**ohlcv_map, "returns": returns}) as registry:
+        handle = registry.handle
+        assert len(pickle.dumps(handle)) < 1000
+
+        df = registry.frame("SYM1/USDC:USDC")
+        expected = ohlcv_map["SYM1/USDC:USDC"]
+        assert np.array_equal(df["close"], expected["close"])
+        assert df["datetime"].iloc[0].value // 10**6 == expected["timestamp"].iloc[0]
+        del df
+
+        with handle.attach() as shared:
+            view = shared["returns"]
+            assert view.dtype == np.float32 and np.array_equal(view, returns)
+            with pytest.raises(ValueError):
+                view[0] = 1.0
+            del view
+
+        with ProcessPoolExecutor(2) as pool:
+            results = list(pool.map(close_sum, [handle] * 3, list(ohlcv_map)))
+
+        for (total, writeable, owns), ohlcv in zip(results, ohlcv_map.values()):
+            assert total == pytest.approx(ohlcv["close"].sum())
+            assert not writeable and not owns
+
+    with pytest.raises(FileNotFoundError):
+        handle.attach()
+
+
+def test_close_refuses_while_views_are_alive():
+    registry = CandleRegistry({"SYM/USDC:USDC": history(50, seed=1)})
+    df = registry.frame("SYM/USDC:USDC")
+    with pytest.raises(BufferError):
+        registry.close()
+    assert df["close"].iloc[-1] > 0
+
+    shared = registry.handle.attach()
+    view = shared["SYM/USDC:USDC"]
+    with pytest.raises(BufferError):
+        shared.close()
+    assert view[-1, 4] == df["close"].iloc[-1]
+
+    del df, view
+    shared.close()
+    registry.close()
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field, asdict
-from collections import defaultdict
+from collections import Counter, defaultdict
 from datetime import datetime
 from loguru import logger
 import pandas as pd
@@ -30,6 +30,8 @@ class TestPosition:
 
 
 class MockExchange:
+    has = {"createOrders": True, "fetchTickers": True}
+
     def __init__(self):
         self.positions: dict[str, TestPosition] = {}
         self.open_orders: dict[str, list[TestOrder]] = defaultdict(list)
@@ -37,9 +39,13 @@ class MockExchange:
 
         # Track history
         self.trade_history: list[TestPosition] = []
+        self.order_batches: list[list[str]] = []
         # self.position_history: list[dict] = []
         # self.equity_history: list[dict] = []
 
+        # Requests per exchange method, as they would hit the exchange API
+        self.requests: Counter[str] = Counter()
+
     def set_ohlcv(self, symbol: str, ohlcv_data: pd.DataFrame):
         self.ohlcv_map[symbol] = ohlcv_data
 
@@ -51,20 +57,33 @@ class MockExchange:
         return ohlcv[col].iloc[-1]
 
     async def load_markets(self):
+        self.requests["load_markets"] += 1
         logger.info("Load markets")
         pass
 
     async def set_leverage(self, leverage: int, symbol: str):
+        self.requests["set_leverage"] += 1
         logger.info(f"Backtest: Set leverage {leverage}x for {symbol}")
 
     async def set_margin_mode(self, margin_mode, symbol: str):
+        self.requests["set_margin_mode"] += 1
         logger.info(f"Backtest: Set margin mode {margin_mode} for {symbol}")
 
     async def fetch_ticker(self, symbol: str) -> dict:
+        self.requests["fetch_ticker"] += 1
         price = self.current_price(symbol)
         return {"symbol": symbol, "last": price}
 
+    async def fetch_tickers(self, symbols: list[str] | None = None) -> dict:
+        self.requests["fetch_tickers"] += 1
+        symbols = symbols or list(self.ohlcv_map)
+        return {
+            symbol: {"symbol": symbol, "last": self.current_price(symbol)}
+            for symbol in symbols
+        }
+
     async def fetch_positions(self) -> list[dict]:
+        self.requests["fetch_positions"] += 1
         return [
             {
                 "symbol": symbol,
@@ -77,6 +96,7 @@ class MockExchange:
         ]
 
     async def fetch_ohlcv(self, symbol: str, timeframe: str, limit: int = 200) -> list:
+        self.requests["fetch_ohlcv"] += 1
         df_ohlcv = self.ohlcv_map.get(symbol)
         if df_ohlcv is None:
             raise ValueError(f"No OHLCV data for {symbol}")
@@ -97,6 +117,18 @@ class MockExchange:
         amount: float,
         price: float | None = None,
         params: dict | None = None,
+    ) -> dict:
+        self.requests["create_order"] += 1
+        return self._place_order(symbol, type, side, amount, price, params)
+
+    def _place_order(
+        self,
+        symbol: str,
+        type: str,
+        side: str,
+        amount: float,
+        price: float | None = None,
+        params: dict | None = None,
     ) -> dict:
         params = params or {}
 
@@ -144,7 +176,21 @@ class MockExchange:
 
         return {"id": f"stop_{symbol}", "info": {}}
 
+    async def create_orders(self, orders: list[dict], params: dict | None = None):
+        self.requests["create_orders"] += 1
+        self.order_batches.append([order["symbol"] for order in orders])
+        results = []
+        for order in orders:
+            # Rejected orders are returned inline, like Binance batchOrders
+            result = self._place_order(**order)
+            results.append(
+                result or {"id": None, "info": {"code": -2022, "msg": "Rejected"}}
+            )
+
+        return results
+
     async def cancel_all_orders(self, symbol: str):
+        self.requests["cancel_all_orders"] += 1
         if orders := self.open_orders.get(symbol):
             count = len(orders)
             self.open_orders[symbol] = []
@@ -0,0 +1,91 @@
+import asyncio
+import math
+
+from src.bots.trading_bot import TradingBot
+from src.models.trading import Trend
+from src.monitoring.journal import (
+    HEADER,
+    RECORD,
+    Action,
+    TradeJournal,
+    journal_frame,
+    read_journal,
+)
+from src.strategies.momentum_strategies import EMATrendStrategy
+from tests.helpers import config, mock_exchange
+
+SYMBOLS = [f"SYM{i}/USDC:USDC" for i in range(5)]
+
+
+def test_journal_round_trip(tmp_path):
+    path = tmp_path / "journal.bin"
+    journal = TradeJournal(path)
+    journal.cycle = 3
+    journal.decision("SOL/USDC:USDC", Trend.DOWN, Trend.UP, 150.5, Action.REVERSE)
+    order = {"symbol": "SOL/USDC:USDC", "side": "buy", "amount": 2.0}
+    journal.order({**order, "params": {"callbackRate": 1.2}})
+    journal.fill(order, {"id": "1", "average": 150.7, "filled": 2.0})
+    journal.close()
+
+    # Reopening appends after the existing records
+    journal = TradeJournal(path)
+    journal.error(order)
+    journal.close()
+
+    records = read_journal(path)
+    assert path.stat().st_size == HEADER.size + 4 * RECORD.size
+    assert records["cycle"].tolist() == [3, 3, 3, 0]
+    assert records["value"][1] == 1.2 and math.isnan(records["value"][0])
+
+    df = journal_frame(path)
+    assert df["kind"].tolist() == ["DECISION", "ORDER", "FILL", "ERROR"]
+    assert df["action"][0] == "REVERSE"
+    assert df["symbol"].eq("SOL/USDC:USDC").all()
+    assert df.loc[0, ["position_trend", "market_trend"]].tolist() == [-1, 1]
+    assert df.loc[2, "price"] == 150.7 and df.loc[3, "side"] == 1
+
+    # Records after close are dropped instead of silently queued
+    journal.error(order)
+    assert journal.dropped == 1 and len(read_journal(path)) == 4
+
+    # A partially written last record is ignored
+    with path.open("ab") as f:
+        f.write(b"\x00" * (RECORD.size // 2))
+    assert len(read_journal(path)) == 4
+
+
+def test_unpackable_record_is_skipped_alone(tmp_path):
+    path = tmp_path / "journal.bin"
+    journal = TradeJournal(path)
+    order = {"symbol": "SOL/USDC:USDC", "side": "buy", "amount": 2.0}
+    journal.error(order)
+    # Out of range for the unsigned cycle field
+    journal.cycle = -1
+    journal.error(order)
+    journal.cycle = 1
+    journal.error(order)
+    journal.close()
+
+    assert read_journal(path)["cycle"].tolist() == [0, 1]
+
+    # Closing twice is harmless
+    journal.close()
+
+
+def test_bot_journals_decisions_and_orders(tmp_path):
+    path = tmp_path / "journal.bin"
+    journal = TradeJournal(path)
+    exchange = mock_exchange(SYMBOLS, 200)
+    bot = TradingBot(exchange, EMATrendStrategy(config(SYMBOLS)), journal=journal)
+    asyncio.run(bot.trade())
+    journal.close()
+
+    df = journal_frame(path)
+    decisions = df[df["kind"] == "DECISION"]
+    assert sorted(decisions["symbol"]) == SYMBOLS
+    assert (df["cycle"] == 1).all()
+
+    signals = decisions["action"].isin(["OPEN", "REVERSE"]).sum()
+    orders = df[df["kind"] == "ORDER"]
+    assert len(orders) == 2 * signals
+    assert (df["kind"] == "FILL").sum() + (df["kind"] == "ERROR").sum() == len(orders)
@@ -0,0 +1,38 @@
+import asyncio
+
+from src.monitoring.metrics import MetricsRegistry, MetricsServer
+
+
+def test_histogram_render():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency", "test", ("stage",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage="fetch")
+    histogram.observe(0.5, stage="fetch")
+    histogram.observe(5.0, stage="fetch")
+
+    text = registry.render()
+    assert 'latency_bucket{stage="fetch",le="0.1"} 1' in text
+    assert 'latency_bucket{stage="fetch",le="1.0"} 2' in text
+    assert 'latency_bucket{stage="fetch",le="+Inf"} 3' in text
+    assert 'latency_count{stage="fetch"} 3' in text
+    assert histogram.count(stage="fetch") == 3
+
+
+def test_metrics_server():
+    registry = MetricsRegistry()
+    registry.gauge("skew", "test").set(1.5)
+
+    async def request(path: str) -> str:
+        server = MetricsServer(registry, host="127.0.0.1", port=0)
+        await server.start()
+        port = server.server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        response = (await reader.read()).decode()
+        writer.close()
+        await server.stop()
+        return response
+
+    assert "skew 1.5" in asyncio.run(request("/metrics"))
+    assert "404" in asyncio.run(request("/unknown"))
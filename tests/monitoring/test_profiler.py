@@ -0,0 +1,44 @@
+import asyncio
+import pstats
+
+from src.monitoring.profiler import CycleProfiler
+
+
+async def cycle():
+    total = 0
+    for _ in range(5):
+        total += sum(i * i for i in range(200_000))
+        await asyncio.sleep(0)
+    return total
+
+
+def test_cycle_profiler_writes_profiles(tmp_path):
+    profiler = CycleProfiler(tmp_path, interval=0.001)
+    profiler.arm(1)
+
+    asyncio.run(profiler.run(cycle, strategy="KalmanTrendStrategy", symbols=3))
+    assert not profiler.armed
+
+    pstats_files = list(tmp_path.glob("*-KalmanTrendStrategy-3symbols.pstats"))
+    collapsed_files = list(tmp_path.glob("*-KalmanTrendStrategy-3symbols.collapsed"))
+    assert len(pstats_files) == 1 and len(collapsed_files) == 1
+    assert pstats.Stats(str(pstats_files[0])).total_calls > 0
+    assert "cycle (test_profiler.py)" in collapsed_files[0].read_text()
+
+    # Disarmed profiler runs the cycle without writing anything
+    asyncio.run(profiler.run(cycle, strategy="KalmanTrendStrategy", symbols=3))
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_cycles_profiled_within_a_second_do_not_collide(tmp_path):
+    profiler = CycleProfiler(tmp_path, interval=0.001)
+    profiler.arm(3)
+
+    async def noop():
+        pass
+
+    for _ in range(3):
+        asyncio.run(profiler.run(noop, strategy="EMATrendStrategy", symbols=1))
+
+    assert len(list(tmp_path.glob("*.pstats"))) == 3
+    assert len(list(tmp_path.glob("*.collapsed"))) == 3
@@ -0,0 +1,124 @@
+import asyncio
+import dataclasses
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.bots.trading_bot import TradingBot
+from src.models.exchange import Limit, Market, MinMax, Precision
+from src.risk.engine import RiskEngine
+from src.strategies.momentum_strategies import EMATrendStrategy
+from tests.helpers import config, mock_exchange, synthetic_ohlcv
+from tests.http_exchange import BinanceStandIn
+
+SYMBOLS = [f"SYM{i}/USDC:USDC" for i in range(4)]
+
+
+def closes(n_bars: int) -> dict[str, pd.Series]:
+    return {
+        symbol: synthetic_ohlcv(n_bars, seed=i).set_index("timestamp")["close"]
+        for i, symbol in enumerate(SYMBOLS)
+    }
+
+
+def market(symbol: str, max_leverage: float, min_cost: float = 5.0) -> Market:
+    unbounded = MinMax(None, None)
+    limit = Limit(
+        amount=MinMax(0.001, None),
+        price=unbounded,
+        cost=MinMax(min_cost, None),
+        leverage=MinMax(1, max_leverage),
+        market=MinMax(None, 1_000.0),
+    )
+    return Market(symbol, limit, Precision(0.001, 0.01, None, None, None))
+
+
+def test_incremental_update_matches_full_history():
+    history = closes(400)
+    full = RiskEngine(SYMBOLS, 250.0, 5, halflife=20)
+    full.update(history)
+
+    incremental = RiskEngine(SYMBOLS, 250.0, 5, halflife=20)
+    incremental.update({s: c.iloc[:150] for s, c in history.items()})
+    for end in range(151, 401):
+        incremental.update({s: c.iloc[:end] for s, c in history.items()})
+
+    np.testing.assert_allclose(incremental.covariance, full.covariance)
+    assert incremental.observations.tolist() == [398] * len(SYMBOLS)
+
+    # Bias corrected EWMA variance of zero mean log returns
+    returns = np.log(history[SYMBOLS[0]]).diff().iloc[1:-1].to_numpy()
+    weights = full.decay ** np.arange(len(returns) - 1, -1, -1)
+    variance = (weights * returns**2).sum() / weights.sum()
+    assert full.volatility[0] == pytest.approx(np.sqrt(variance))
+
+
+def test_target_notionals_respect_limits():
+    engine = RiskEngine(SYMBOLS, 250.0, 5, halflife=20)
+    engine.update(closes(300))
+    engine.set_markets({SYMBOLS[1]: market(SYMBOLS[1], max_leverage=2)})
+    prices = np.full(len(SYMBOLS), 100.0)
+    signals = np.array([1, -1, 1, 0])
+
+    # Leverage cap of the market, 250 / 5 margin at 2x
+    notionals = engine.target_notionals(signals, prices, np.zeros(len(SYMBOLS)))
+    assert notionals.tolist() == [250.0, -100.0, 250.0, 0.0]
+
+    held = np.array([0.0, 0.0, 0.0, 250.0])
+    engine.max_volatility = 3.0
+    notionals = engine.target_notionals(signals, prices, held)
+    assert engine.portfolio_volatility(notionals + held) == pytest.approx(3.0)
+
+    engine.max_gross_notional = 400.0
+    notionals = engine.target_notionals(signals, prices, held)
+    assert np.abs(notionals).sum() == pytest.approx(150.0)
+
+    # Per position volatility target and exchange minimum cost
+    engine.max_volatility = engine.max_gross_notional = None
+    engine.target_volatility = engine.volatility[0] / 2
+    engine.set_markets({SYMBOLS[2]: market(SYMBOLS[2], 5, min_cost=1_000.0)})
+    notionals = engine.target_notionals(signals, prices, np.zeros(len(SYMBOLS)))
+    assert notionals[0] == pytest.approx(125.0) and notionals[2] == 0.0
+
+
+def test_bot_sizes_entries_with_risk_engine():
+    exchange = mock_exchange(SYMBOLS, 300)
+    cfg = dataclasses.replace(
+        config(SYMBOLS), risk={"halflife": 20, "max_gross_notional": 500.0}
+    )
+    bot = TradingBot(exchange, EMATrendStrategy(cfg))
+    asyncio.run(bot.trade())
+
+    entries = [p.size * p.entry_price for p in exchange.positions.values()]
+    assert len(entries) == len(SYMBOLS)
+    assert sum(entries) == pytest.approx(500.0, rel=0.01)
+
+
+def test_on_start_caps_entries_with_market_limits():
+    symbols = ["SOL/USDC:USDC", "SUI/USDC:USDC"]
+    mock = mock_exchange(symbols, 300)
+
+    async def run():
+        stand_in = BinanceStandIn(mock)
+        await stand_in.start()
+        exchange = stand_in.client({"enableRateLimit": False})
+        try:
+            # ccxt keeps loaded markets, lower the leverage limit of one symbol
+            await exchange.load_markets()
+            exchange.markets[symbols[0]]["limits"]["leverage"]["max"] = 2
+            cfg = dataclasses.replace(config(symbols), risk={"halflife": 20})
+            bot = TradingBot(exchange, EMATrendStrategy(cfg))
+            await bot.on_start()
+        finally:
+            await exchange.close()
+            await stand_in.stop()
+        return bot
+
+    bot = asyncio.run(run())
+    assert bot.risk.max_notional.tolist() == [100.0, 250.0]
+    assert bot.risk.min_cost.tolist() == [5.0, 5.0]
+    assert bot.risk.max_amount.tolist() == [100_000.0, 100_000.0]
+
+    notionals = {symbol: p.size * p.entry_price for symbol, p in mock.positions.items()}
+    assert notionals[symbols[0]] == pytest.approx(100.0, rel=0.01)
+    assert notionals[symbols[1]] == pytest.approx(250.0, rel=0.01)
@@ -0,0 +1,98 @@
+import itertools
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from pykalman import KalmanFilter
+
+from src.strategies import kalman
+from src.strategies.kalman import BatchedKalmanFilter, KalmanParams
+from src.strategies.momentum_strategies import KalmanTrendStrategy
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+def closes() -> dict[str, pd.Series]:
+    ohlcv = pd.read_csv(DATA_DIR / "ohlcv-1h-sol-usdc-usdc.csv")
+    return {
+        "SOL/USDC:USDC": ohlcv["close"].iloc[:120].reset_index(drop=True),
+        "SUI/USDC:USDC": ohlcv["close"].iloc[500:620].reset_index(drop=True) / 50,
+        "ETH/USDC:USDC": ohlcv["close"].iloc[900:990].reset_index(drop=True) * 20,
+    }
+
+
+def test_batched_kalman_matches_pykalman():
+    series = list(closes().values())[:2]
+    observations = np.column_stack([s.to_numpy() for s in series])
+
+    kf = BatchedKalmanFilter()
+    params = kf.em(observations, KalmanParams.default(2))
+    smoothed = kf.smooth(observations, params)
+
+    for i, s in enumerate(series):
+        reference = KalmanFilter().em(s)
+        expected, _ = reference.smooth(s.values)
+        np.testing.assert_allclose(smoothed[:, i], expected[:, 0], rtol=1e-9)
+        np.testing.assert_allclose(
+            params.observation_covariance[i],
+            reference.observation_covariance[0, 0],
+            rtol=1e-9,
+        )
+
+
+def test_batched_trends_match_per_symbol_trends(config):
+    prices = closes()
+    strategy = KalmanTrendStrategy(config)
+    references = {symbol: KalmanTrendStrategy(config) for symbol in prices}
+
+    # Two cycles, so warm started parameters are compared as well
+    for _ in range(2):
+        batched = strategy.current_trends(prices)
+        for symbol, series in prices.items():
+            assert batched[symbol] == references[symbol].current_trend(series)
+
+
+def test_em_tolerance_stops_series_independently():
+    series = list(closes().values())[:2]
+    observations = np.column_stack([s.to_numpy() for s in series])
+    kf = BatchedKalmanFilter(n_iter=50, tolerance=1e-2)
+
+    batched = kf.fit(observations, KalmanParams.default(2))
+    assert batched.converged.all()
+    assert batched.iterations[0] != batched.iterations[1]
+
+    for i, s in enumerate(series):
+        alone = kf.fit(s.to_numpy()[:, None], KalmanParams.default(1))
+        assert batched.iterations[i] == alone.iterations[0]
+        np.testing.assert_allclose(
+            batched.params.transition_covariance[i],
+            alone.params.transition_covariance[0],
+        )
+
+
+def test_em_time_budget_runs_at_least_one_iteration():
+    observations = closes()["SOL/USDC:USDC"].to_numpy()[:, None]
+    fit = BatchedKalmanFilter(n_iter=50, time_budget=0.0).fit(
+        observations, KalmanParams.default(1)
+    )
+    assert fit.iterations[0] == 1
+    assert not fit.converged[0]
+
+
+def test_em_time_budget_is_independent_of_series_count(monkeypatch):
+    # Every clock reading advances one second, an iteration takes two
+    ticks = itertools.count()
+    monkeypatch.setattr(kalman.time, "perf_counter", lambda: float(next(ticks)))
+    observations = np.column_stack(list(closes().values())[:2] * 2)[:90]
+
+    for n_series in (1, 4):
+        start = next(ticks)
+        fit = BatchedKalmanFilter(n_iter=50, time_budget=5.0).fit(
+            observations[:, :n_series], KalmanParams.default(n_series)
+        )
+        # Less the two readings taken here
+        elapsed = next(ticks) - start - 2
+
+        # Same iterations however many series share the budget, overrunning
+        # it by at most the one iteration
+        assert fit.iterations.tolist() == [3] * n_series
+        assert elapsed <= 5.0 + 2
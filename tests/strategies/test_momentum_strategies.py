@@ -1,7 +1,5 @@
-import pytest
 import pandas as pd
 
-from src.models.config import Config
 from src.models.trading import Trend
 from src.strategies.momentum_strategies import (
     EMATrendStrategy,
@@ -10,34 +8,6 @@ from src.strategies.momentum_strategies import (
 )
 
 
-@pytest.fixture
-def config():
-    symbols = ["SUI/USDC:USDC"]
-    rate = "1h"
-    timeframe = "1h"
-    leverage = 5
-    position_notional_value = 10
-    atr_stop_loss = 1.5
-    enable_trading = False
-    params = {
-        "ema_window": 8,
-        "smooth_window": 11,
-        "polyorder": 5,
-    }
-
-    config = Config(
-        symbols=symbols,
-        rate=rate,
-        timeframe=timeframe,
-        leverage=leverage,
-        position_notional_value=position_notional_value,
-        atr_stop_loss=atr_stop_loss,
-        enable_trading=enable_trading,
-        params=params,
-    )
-    return config
-
-
 def test_ema_trend_strategy_up(config):
     strategy = EMATrendStrategy(config)
     prices = pd.Series([178.8, 179.2, 179.7, 180.6, 181.0, 183.2, 186.0, 188.2])
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from scipy.signal import savgol_filter
+from ta.trend import EMAIndicator
+
+from src.models.trading import Trend
+from src.strategies.savgol import StreamingSavgolFilter
+from src.strategies.momentum_strategies import SavgolTrendStrategy
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+SYMBOL = "SOL/USDC:USDC"
+
+
+def closes() -> pd.Series:
+    ohlcv = pd.read_csv(DATA_DIR / "ohlcv-1h-sol-usdc-usdc.csv")
+    return ohlcv.set_index("timestamp")["close"]
+
+
+def test_streaming_savgol_matches_savgol_filter():
+    prices = closes()
+    streaming = StreamingSavgolFilter(ema_window=8, smooth_window=11, polyorder=5)
+
+    for end in range(100, 400):
+        window = prices.iloc[end - 100 : end]
+        emas = EMAIndicator(window, 8, fillna=True).ema_indicator()
+        smoothed = savgol_filter(emas.values, 11, 5)
+        expected = smoothed[-1] - smoothed[-2]
+        np.testing.assert_allclose(streaming.update(window), expected, atol=1e-7)
+
+
+def test_streaming_trends_match_full_trends(config):
+    prices = closes()
+    strategy = SavgolTrendStrategy(config)
+
+    # Skip candles now and then, which forces a rebuild of the filter state
+    for end in list(range(50, 300)) + list(range(320, 330)):
+        window = prices.iloc[max(end - 200, 0) : end]
+        trends = strategy.current_trends({SYMBOL: window})
+        expected = strategy.current_trend(window.reset_index(drop=True))
+        assert trends[SYMBOL] == expected
+
+
+def test_streaming_trend_not_enough_entries(config):
+    strategy = SavgolTrendStrategy(config)
+    trends = strategy.current_trends({SYMBOL: closes().iloc[:5]})
+    assert trends[SYMBOL] == Trend.NONE